@@ -0,0 +1,861 @@
+from typing import Dict, Iterator, List, Set, Tuple
+from Checkers import Checkers, Board, Moves, Positions, Sequence, Sequences
+
+
+class BitboardCheckers(Checkers):
+    """
+    checkers class whose board is kept in bitboards: every kind of piece (white/black, man/king)
+    is an integer mask where square (x, y) is the bit number x*size + y.
+    the moves are generated with shifts of the masks and played by flipping their bits,
+    the list board, the counts and the pieces of every player are made from the masks
+    only when they are read (getBoard, the tablebase, the GUI), and the evaluation functions of Checkers
+    are replaced by versions that count the bits of the masks, so it gives the same moves and scores as Checkers
+    """
+
+    # the masks of every board size, like Checkers.TABLES
+    MASKS = {}
+
+    def __init__(self, size: int = 8, ttSize: float = 0) -> None:
+        """Make the initial board of the game and its bitboards
+
+        Args:
+            size (int, optional): size of the checkers board. Defaluts to 8.
+            ttSize (float, optional): the memory of the transposition table in megabytes,
+                0 disables it. Defaults to 0.
+        """
+        super().__init__(size, ttSize)
+
+        if size not in self.MASKS:
+            self.MASKS[size] = self.makeMasks(size)
+        (self.squares, self.bits, self.full, self.shifts, self.stepFrom, self.jumpFrom, self.flankFrom,
+         self.rowWeights, self.columnWeights, self.squareWeights, self.backRows, self.middleBox, self.middleRows,
+         self.cornerMask) = self.MASKS[size]
+        # the zobrist keys of every square by its bit number
+        self.zobristSquares = [self.zobrist[x][y] for x, y in self.squares]
+        # the directions of each player (in the order of self.directions) and their shifts
+        self.playerShifts = [[(k, self.shifts[k]) for k in self.directions[player]] for player in range(2)]
+
+    def makeMasks(self, size: int):
+        """Make the masks of the squares of a board
+
+        Args:
+            size (int): size of the checkers board
+
+        Returns:
+            squares: squares[i] is the position of bit i.
+            bits: bits[x][y] is the bit of the position (x, y).
+            full: the mask of all the squares.
+            shifts: shifts[k] is the shift of a bit when moving one step in direction k.
+            stepFrom, jumpFrom: the squares that can step / jump in direction k without leaving the board.
+            flankFrom: the squares that have neighbours in both direction k and its opposite.
+            rowWeights, columnWeights, squareWeights: the bit planes and their weights, the number of pieces
+                of a mask in every plane times its weight sum up to the sum of x, of y and of x*x + y*y of the pieces.
+            backRows: backRows[player] is the first row of the player (WHITE row 0, BLACK the last row).
+            middleBox, middleRows: the middle squares of the two middle rows and the other squares of those rows.
+            cornerMask: the positions next to the corners of the board.
+        """
+        squares = [(i // size, i % size) for i in range(size * size)]
+        bits = [[1 << (x * size + y) for y in range(size)] for x in range(size)]
+        full = (1 << (size * size)) - 1
+        shifts = [self.DX[k] * size + self.DY[k] for k in range(4)]
+        stepFrom = [0] * 4
+        jumpFrom = [0] * 4
+        flankFrom = [0] * 4
+        for k in range(4):
+            for x in range(size):
+                for y in range(size):
+                    if self.steps[x][y][k] is not None:
+                        stepFrom[k] |= bits[x][y]
+                    if self.jumps[x][y][k] is not None:
+                        jumpFrom[k] |= bits[x][y]
+                    if self.steps[x][y][k] is not None and self.steps[x][y][3 - k] is not None:
+                        flankFrom[k] |= bits[x][y]
+        # a value of every square is a sum of powers of two, so the sum of the values of the pieces is
+        # the number of pieces in every bit plane (the squares whose value has the bit) times its power
+        def planes(value):
+            return [
+                (sum(bits[x][y] for x in range(size) for y in range(size) if value(x, y) >> b & 1), 1 << b)
+                for b in range(value(size - 1, size - 1).bit_length())
+            ]
+        rowWeights = planes(lambda x, y: x)
+        columnWeights = planes(lambda x, y: y)
+        squareWeights = planes(lambda x, y: x*x + y*y)
+        backRows = [sum(bits[size - 1]), sum(bits[0])]
+        middleBox = middleRows = 0
+        for x in (size // 2 - 1, size // 2):
+            for y in range(size):
+                if y >= size / 2 - 2 and y < size / 2 + 2:
+                    middleBox |= bits[x][y]
+                else:
+                    middleRows |= bits[x][y]
+        cornerMask = sum(bits[x][y] for x, y in self.corners)
+        return (squares, bits, full, shifts, stepFrom, jumpFrom, flankFrom,
+                rowWeights, columnWeights, squareWeights, backRows, middleBox, middleRows, cornerMask)
+
+    @property
+    def board(self) -> Board:
+        """the list board made from the bitboards, changing it doesn't change the game (use setBoard)"""
+        size = self.size
+        board = [[0] * size for _ in range(size)]
+        for piece in range(1, 5):
+            mask = self.bitboards[piece]
+            while mask:
+                low = mask & -mask
+                mask ^= low
+                i = low.bit_length() - 1
+                board[i // size][i % size] = piece
+        return board
+
+    @board.setter
+    def board(self, board: Board):
+        size = len(board)
+        self.bitboards = [0] * 5
+        for x in range(size):
+            for y in range(size):
+                if board[x][y] != 0:
+                    self.bitboards[board[x][y]] |= 1 << (x * size + y)
+
+    @property
+    def counts(self) -> List[int]:
+        """the number of pieces of every kind, counted from the bitboards"""
+        return [0] + [mask.bit_count() for mask in self.bitboards[1:]]
+
+    @property
+    def pieces(self) -> List[Set[Tuple[int, int]]]:
+        """the positions of the pieces of every player (BLACK, WHITE), made from the bitboards"""
+        bb = self.bitboards
+        return [self.positions(bb[self.BLACK_MAN] | bb[self.BLACK_KING]),
+                self.positions(bb[self.WHITE_MAN] | bb[self.WHITE_KING])]
+
+    def positions(self, mask: int) -> Set[Tuple[int, int]]:
+        """Get the positions of the bits of a mask
+
+        Args:
+            mask (int): the mask
+
+        Returns:
+            Set[Tuple[int, int]]: the positions
+        """
+        positions = set()
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            positions.add(self.squares[low.bit_length() - 1])
+        return positions
+
+    def countPieces(self):
+        """The counts and the pieces are made from the bitboards when they are read"""
+
+    def pieceAt(self, bit: int) -> int:
+        """Get the piece of a square
+
+        Args:
+            bit (int): the bit of the square
+
+        Returns:
+            int: the piece, 0 if the square is empty
+        """
+        bb = self.bitboards
+        if bb[self.WHITE_MAN] & bit:
+            return self.WHITE_MAN
+        if bb[self.BLACK_MAN] & bit:
+            return self.BLACK_MAN
+        if bb[self.WHITE_KING] & bit:
+            return self.WHITE_KING
+        if bb[self.BLACK_KING] & bit:
+            return self.BLACK_KING
+        return 0
+
+    def shift(self, bits: int, s: int) -> int:
+        """Shift all the bits of a bitboard by s (to the left if s is positive)
+
+        Args:
+            bits (int): the bitboard
+            s (int): the shift amount
+
+        Returns:
+            int: the shifted bitboard
+        """
+        return bits << s if s > 0 else bits >> -s
+
+    def nextPositions(self, x: int, y: int) -> Tuple[Positions, Positions]:
+        """Get the possible next positions for a given position
+
+        Args:
+            x (int): x position
+            y (int): y position
+
+        Returns:
+            (Positions, Positions): next normal positions, next capture positions
+        """
+        bits = self.bits
+        piece = self.pieceAt(bits[x][y])
+        if piece == 0:
+            return []
+
+        bb = self.bitboards
+        player = piece % 2
+        if player == self.WHITE:
+            opponent = bb[self.BLACK_MAN] | bb[self.BLACK_KING]
+        else:
+            opponent = bb[self.WHITE_MAN] | bb[self.WHITE_KING]
+        occupied = bb[1] | bb[2] | bb[3] | bb[4]
+        captureMoves = []
+        normalMoves = []
+        steps = self.steps[x][y]
+        jumps = self.jumps[x][y]
+        directions = self.directions[player]
+        # only forward for men and both forward and backward for Kings
+        rng = 2 if piece <= 2 else 4
+        for i in range(rng):
+            k = directions[i]
+            step = steps[k]
+            if step is not None:
+                bit = bits[step[0]][step[1]]
+                if not occupied & bit:
+                    normalMoves.append(step)
+                elif opponent & bit:
+                    jump = jumps[k]
+                    if jump is not None and not occupied & bits[jump[0]][jump[1]]:
+                        captureMoves.append(jump)
+
+        return normalMoves, captureMoves
+
+    def jumpSources(self, player: int) -> Tuple[List[int], int]:
+        """Get the pieces of the player that can capture in each of its directions
+
+        Args:
+            player (int): the type of player (WHITE, BLACK)
+
+        Returns:
+            sources (List[int]): the mask of the pieces that can capture in each direction (the order of
+                self.directions, the last two are only there if the player has kings).
+            allSources (int): the mask of all the pieces that can capture.
+        """
+        bb = self.bitboards
+        if player == self.WHITE:
+            men, kings = bb[self.WHITE_MAN], bb[self.WHITE_KING]
+            opponent = bb[self.BLACK_MAN] | bb[self.BLACK_KING]
+        else:
+            men, kings = bb[self.BLACK_MAN], bb[self.BLACK_KING]
+            opponent = bb[self.WHITE_MAN] | bb[self.WHITE_KING]
+        movers = men | kings
+        empty = self.full & ~(movers | opponent)
+        directions = self.playerShifts[player] if kings else self.playerShifts[player][:2]
+
+        # the men only move in the first two directions
+        sources = []
+        allSources = 0
+        for i, (k, s) in enumerate(directions):
+            if i == 2:
+                movers = kings
+            if s > 0:
+                src = movers & self.jumpFrom[k] & (opponent >> s) & (empty >> 2 * s)
+            else:
+                src = movers & self.jumpFrom[k] & (opponent << -s) & (empty << -2 * s)
+            sources.append(src)
+            allSources |= src
+        return sources, allSources
+
+    def stepSources(self, player: int) -> Tuple[List[int], int]:
+        """Get the pieces of the player that can move without capture in each of its directions
+
+        Args:
+            player (int): the type of player (WHITE, BLACK)
+
+        Returns:
+            sources (List[int]): the mask of the pieces that can move in each direction (the order of
+                self.directions, the last two are only there if the player has kings).
+            allSources (int): the mask of all the pieces that can move.
+        """
+        bb = self.bitboards
+        if player == self.WHITE:
+            men, kings = bb[self.WHITE_MAN], bb[self.WHITE_KING]
+        else:
+            men, kings = bb[self.BLACK_MAN], bb[self.BLACK_KING]
+        movers = men | kings
+        empty = self.full & ~(bb[1] | bb[2] | bb[3] | bb[4])
+        directions = self.playerShifts[player] if kings else self.playerShifts[player][:2]
+
+        sources = []
+        allSources = 0
+        for i, (k, s) in enumerate(directions):
+            if i == 2:
+                movers = kings
+            if s > 0:
+                src = movers & self.stepFrom[k] & (empty >> s)
+            else:
+                src = movers & self.stepFrom[k] & (empty << -s)
+            sources.append(src)
+            allSources |= src
+        return sources, allSources
+
+    def moveSources(self, player: int) -> Tuple[List[int], int, int]:
+        """Get the pieces of the player that can move in each of its directions,
+        only the captures if there is a capture (they are forced)
+
+        Args:
+            player (int): the type of player (WHITE, BLACK)
+
+        Returns:
+            sources (List[int]): the mask of the pieces that can move in each direction (the order of
+                self.directions, the last two are only there if the player has kings).
+            allSources (int): the mask of all the pieces that can move.
+            step (int): 2 for capture moves and 1 for normal moves.
+        """
+        sources, allSources = self.jumpSources(player)
+        if allSources != 0:
+            return sources, allSources, 2
+        sources, allSources = self.stepSources(player)
+        return sources, allSources, 1
+
+    def movesOf(self, player: int, sources: List[int], allSources: int, step: int) -> Moves:
+        """Get the moves of the pieces of the given masks, like nextMoves
+
+        Args:
+            player (int): the type of player (WHITE, BLACK)
+            sources (List[int]): the mask of the pieces that can move in each direction
+            allSources (int): the mask of all the pieces that can move
+            step (int): 2 for capture moves and 1 for normal moves
+
+        Returns:
+            Moves: the moves of the pieces
+        """
+        shifts = [step * s for _, s in self.playerShifts[player][:len(sources)]]
+        squares = self.squares
+        moves = []
+        # go through the pieces in the same order of the board (row by row)
+        while allSources:
+            low = allSources & -allSources
+            allSources ^= low
+            i = low.bit_length() - 1
+            moves.append((squares[i], [squares[i + shifts[d]] for d in range(len(sources)) if sources[d] & low]))
+        return moves
+
+    def nextMoves(self, player: int) -> Moves:
+        """Get the next moves of the game board for a certian player
+
+        Args:
+            player (int): the type of player (WHITE, BLACK)
+
+        Returns:
+            Moves: valid moves for the player
+        """
+        return self.movesOf(player, *self.moveSources(player))
+
+    def captureMoves(self, player: int) -> Moves:
+        """Get the first captures of the pieces of a player, only the capture masks are made
+
+        Args:
+            player (int): the type of player (WHITE, BLACK)
+
+        Returns:
+            Moves: the captures of every piece that can capture, empty if the player can't capture
+        """
+        sources, allSources = self.jumpSources(player)
+        if allSources == 0:
+            return []
+        return self.movesOf(player, sources, allSources, 2)
+
+    def quietMoves(self, player: int) -> Iterator[Sequence]:
+        """Generate the moves without capture of a player piece by piece (in the order of nextMoves),
+        the board must be the same whenever the next move is taken
+
+        Args:
+            player (int): the type of player (WHITE, BLACK)
+
+        Yields:
+            Sequence: the next move
+        """
+        sources, allSources = self.stepSources(player)
+        shifts = [s for _, s in self.playerShifts[player][:len(sources)]]
+        squares = self.squares
+        man = self.bitboards[self.WHITE_MAN if player == self.WHITE else self.BLACK_MAN]
+        # the men are promoted on the first row of the opponent
+        lastRow = self.backRows[1 - player]
+        while allSources:
+            low = allSources & -allSources
+            allSources ^= low
+            i = low.bit_length() - 1
+            isMan = man & low != 0
+            for d in range(len(sources)):
+                if sources[d] & low:
+                    n = i + shifts[d]
+                    yield [squares[i], squares[n]], [], isMan and lastRow >> n & 1 == 1
+
+    def isQuietMove(self, player: int, path: Positions) -> bool:
+        """Check if a path (of the transposition table or a killer move) is a move without capture
+        of the player on the current board
+
+        Args:
+            player (int): the type of player (WHITE, BLACK)
+            path (Positions): the path of the move
+
+        Returns:
+            bool: the path is a valid move without capture
+        """
+        if len(path) != 2:
+            return False
+        x, y = path[0]
+        piece = self.pieceAt(self.bits[x][y])
+        if piece == 0 or piece % 2 != player:
+            return False
+        return path[1] in self.nextPositions(x, y)[0]
+
+    def captureSequences(self, captureMoves: Moves) -> Sequences:
+        """Get the complete capture moves that start with the given captures,
+        they are found on copies of the masks without playing the moves
+
+        Args:
+            captureMoves (Moves): the first captures of the pieces, as given by nextMoves
+
+        Returns:
+            Sequences: the capture moves
+        """
+        size = self.size
+        bb = self.bitboards
+        empty = self.full & ~(bb[1] | bb[2] | bb[3] | bb[4])
+        sequences = []
+        for (x, y), captures in captureMoves:
+            i = x * size + y
+            piece = self.pieceAt(1 << i)
+            if piece % 2 == self.WHITE:
+                opponent = bb[self.BLACK_MAN] | bb[self.BLACK_KING]
+            else:
+                opponent = bb[self.WHITE_MAN] | bb[self.WHITE_KING]
+            for nx, ny in captures:
+                self.addJumps([(x, y), (nx, ny)], [], i, nx * size + ny, piece, opponent, empty, sequences)
+        return sequences
+
+    def nextSequences(self, player: int) -> Sequences:
+        """Get the complete moves of the game board for a certian player,
+        a capture move continues capturing until the piece can't capture anymore
+
+        Args:
+            player (int): the type of player (WHITE, BLACK)
+
+        Returns:
+            Sequences: valid complete moves for the player
+        """
+        sources, allSources, step = self.moveSources(player)
+        shifts = [step * s for _, s in self.playerShifts[player][:len(sources)]]
+        squares = self.squares
+        sequences = []
+        bb = self.bitboards
+        if step == 2:
+            if player == self.WHITE:
+                opponent = bb[self.BLACK_MAN] | bb[self.BLACK_KING]
+            else:
+                opponent = bb[self.WHITE_MAN] | bb[self.WHITE_KING]
+            empty = self.full & ~(bb[1] | bb[2] | bb[3] | bb[4])
+            while allSources:
+                low = allSources & -allSources
+                allSources ^= low
+                i = low.bit_length() - 1
+                piece = self.pieceAt(low)
+                for d in range(len(sources)):
+                    if sources[d] & low:
+                        n = i + shifts[d]
+                        self.addJumps([squares[i], squares[n]], [], i, n, piece, opponent, empty, sequences)
+            return sequences
+
+        men = bb[self.WHITE_MAN if player == self.WHITE else self.BLACK_MAN]
+        # the men are promoted on the first row of the opponent
+        lastRow = self.backRows[1 - player]
+        while allSources:
+            low = allSources & -allSources
+            allSources ^= low
+            i = low.bit_length() - 1
+            man = men & low != 0
+            for d in range(len(sources)):
+                if sources[d] & low:
+                    n = i + shifts[d]
+                    sequences.append(([squares[i], squares[n]], [], man and lastRow >> n & 1 == 1))
+        return sequences
+
+    def addCaptureSequences(self, path: Positions, captured: Positions, sequences: Sequences):
+        """Add the complete capture moves that start with the given path,
+        they are found on copies of the masks without playing the moves
+
+        Args:
+            path (Positions): the path of the capturing piece, its last step isn't played yet
+            captured (Positions): the positions of the pieces captured before the last step
+            sequences (Sequences): the list to add the complete moves to
+        """
+        size = self.size
+        (x, y), (nx, ny) = path[-2], path[-1]
+        i = x * size + y
+        bb = self.bitboards
+        piece = self.pieceAt(1 << i)
+        if piece % 2 == self.WHITE:
+            opponent = bb[self.BLACK_MAN] | bb[self.BLACK_KING]
+        else:
+            opponent = bb[self.WHITE_MAN] | bb[self.WHITE_KING]
+        empty = self.full & ~(bb[1] | bb[2] | bb[3] | bb[4])
+        self.addJumps(path, captured, i, nx * size + ny, piece, opponent, empty, sequences)
+
+    def addJumps(
+        self, path: Positions, captured: Positions, i: int, n: int, piece: int, opponent: int, empty: int,
+        sequences: Sequences
+    ):
+        """Add the complete capture moves that start with the given path, like addCaptureSequences
+
+        Args:
+            path (Positions): the path of the capturing piece, its last step is the jump from bit i to bit n
+            captured (Positions): the positions of the pieces captured before the last step
+            i (int): the bit number of the capturing piece before the last step
+            n (int): the bit number of the capturing piece after the last step
+            piece (int): the capturing piece
+            opponent (int): the mask of the pieces of the opponent before the last step
+            empty (int): the mask of the empty squares before the last step
+            sequences (Sequences): the list to add the complete moves to
+        """
+        m = (i + n) >> 1
+        captured = captured + [self.squares[m]]
+        opponent ^= 1 << m
+        empty = (empty | (1 << i) | (1 << m)) ^ (1 << n)
+        player = piece % 2
+        if piece <= 2:
+            # a man stops when it's promoted on the first row of the opponent
+            if self.backRows[1 - player] >> n & 1:
+                sequences.append((path, captured, True))
+                return
+            directions = self.playerShifts[player][:2]
+        else:
+            directions = self.playerShifts[player]
+        jumped = False
+        for k, s in directions:
+            if self.jumpFrom[k] >> n & 1 and opponent >> (n + s) & 1 and empty >> (n + 2 * s) & 1:
+                jumped = True
+                self.addJumps(
+                    path + [self.squares[n + 2 * s]], captured, n, n + 2 * s, piece, opponent, empty, sequences
+                )
+        if not jumped:
+            sequences.append((path, captured, False))
+
+    def quietSequence(self, path: Positions) -> Sequence:
+        """Get the complete move of a path without capture
+
+        Args:
+            path (Positions): the path of the move
+
+        Returns:
+            Sequence: the move
+        """
+        (x, y), (nx, ny) = path
+        bit = self.bits[x][y]
+        promoted = (nx == self.size - 1 and self.bitboards[self.WHITE_MAN] & bit != 0) \
+            or (nx == 0 and self.bitboards[self.BLACK_MAN] & bit != 0)
+        return path, [], promoted
+
+    def playMove(self, x: int, y: int, nx: int, ny: int) -> Tuple[bool, int, bool]:
+        """Change the board by playing a move from (x, y) to (nx, ny)
+
+        Args:
+            x (int): the old x position
+            y (int): the old y position
+            nx (int): the new x position
+            ny (int): the new y position
+
+        Returns:
+            canCapture (bool): if the player can capture more pieces.
+            removed (int): the removed piece (if any).
+            promoted (bool) if the current piece is promoted).
+        """
+        size = self.size
+        i = x * size + y
+        n = nx * size + ny
+        bit = 1 << i
+        piece = self.pieceAt(bit)
+        bb = self.bitboards
+        z = self.zobristSquares
+        bb[piece] ^= bit | (1 << n)
+        self.hash ^= z[i][piece] ^ z[n][piece]
+        # the opponent plays next
+        if self.turn == piece % 2:
+            self.turn = 1 - self.turn
+            self.hash ^= self.zobristTurn
+
+        removed = 0
+        if abs(nx - x) == 2:  # capture move
+            m = (i + n) >> 1
+            removed = self.pieceAt(1 << m)
+            bb[removed] ^= 1 << m
+            self.hash ^= z[m][removed]
+
+        # promote to king
+        if piece == self.WHITE_MAN and nx == size - 1 or piece == self.BLACK_MAN and nx == 0:
+            bb[piece] ^= 1 << n
+            bb[piece + 2] |= 1 << n
+            self.hash ^= z[n][piece] ^ z[n][piece + 2]
+            return False, removed, True
+
+        return abs(nx - x) == 2, removed, False
+
+    def undoMove(self, x: int, y: int, nx: int, ny: int, removed=0, promoted=False):
+        """Undo a move and return the board to its previous state
+
+        Args:
+            x (int): the old x position of the played move
+            y (int): the old y position of the played move
+            nx (int): the new x position of the played move
+            ny (int): the new y position of the played move
+            removed (int, optional): the removed piece (if any). Defaults to 0.
+            promoted (bool, optional): if the played piece was recently promoted. Defaults to False.
+        """
+        size = self.size
+        i = x * size + y
+        n = nx * size + ny
+        bit = 1 << n
+        piece = self.pieceAt(bit)
+        bb = self.bitboards
+        z = self.zobristSquares
+        bb[piece] ^= bit
+        # the king of a promoted piece goes back as a man
+        original = piece - 2 if promoted else piece
+        bb[original] |= 1 << i
+        self.hash ^= z[n][piece] ^ z[i][original]
+        # the player of the undone move plays again
+        if self.turn != piece % 2:
+            self.turn = piece % 2
+            self.hash ^= self.zobristTurn
+
+        if removed != 0 and abs(nx - x) == 2:
+            m = (i + n) >> 1
+            bb[removed] |= 1 << m
+            self.hash ^= z[m][removed]
+
+    def playSequence(self, path: Positions) -> Tuple[List[int], bool]:
+        """Change the board by playing a complete move, the piece goes to the end of the path at once
+
+        Args:
+            path (Positions): the path of the played piece
+
+        Returns:
+            removed (List[int]): the removed piece of every step (0 for no piece).
+            promoted (bool): if the piece is promoted.
+        """
+        size = self.size
+        bb = self.bitboards
+        z = self.zobristSquares
+        x, y = path[0]
+        nx, ny = path[-1]
+        i = x * size + y
+        n = nx * size + ny
+        bit = 1 << i
+        piece = 1 if bb[1] & bit else 2 if bb[2] & bit else 3 if bb[3] & bit else 4
+        h = self.hash ^ z[i][piece]
+        removed = []
+        if abs(path[1][0] - x) == 2:
+            previous = i
+            for k in range(1, len(path)):
+                bx, by = path[k]
+                b = bx * size + by
+                m = (previous + b) >> 1
+                middle = 1 << m
+                captured = 1 if bb[1] & middle else 2 if bb[2] & middle else 3 if bb[3] & middle else 4
+                bb[captured] ^= middle
+                h ^= z[m][captured]
+                removed.append(captured)
+                previous = b
+        else:
+            removed.append(0)
+
+        promoted = piece == self.WHITE_MAN and nx == size - 1 or piece == self.BLACK_MAN and nx == 0
+        final = piece + 2 if promoted else piece
+        bb[piece] ^= bit
+        bb[final] |= 1 << n
+        h ^= z[n][final]
+        # the opponent plays next
+        if self.turn == piece % 2:
+            self.turn = 1 - self.turn
+            h ^= self.zobristTurn
+        self.hash = h
+        return removed, promoted
+
+    def undoSequence(self, path: Positions, removed: List[int], promoted: bool = False):
+        """Undo a complete move and return the board to its previous state
+
+        Args:
+            path (Positions): the path of the played piece
+            removed (List[int]): the removed piece of every step
+            promoted (bool, optional): if the piece was promoted. Defaults to False.
+        """
+        size = self.size
+        bb = self.bitboards
+        z = self.zobristSquares
+        x, y = path[0]
+        nx, ny = path[-1]
+        i = x * size + y
+        n = nx * size + ny
+        bit = 1 << n
+        piece = 1 if bb[1] & bit else 2 if bb[2] & bit else 3 if bb[3] & bit else 4
+        original = piece - 2 if promoted else piece
+        bb[piece] ^= bit
+        bb[original] |= 1 << i
+        h = self.hash ^ z[n][piece] ^ z[i][original]
+        if abs(path[1][0] - x) == 2:
+            previous = i
+            for k in range(1, len(path)):
+                bx, by = path[k]
+                b = bx * size + by
+                captured = removed[k - 1]
+                if captured != 0:
+                    m = (previous + b) >> 1
+                    bb[captured] |= 1 << m
+                    h ^= z[m][captured]
+                previous = b
+        # the player of the undone move plays again
+        if self.turn != piece % 2:
+            self.turn = piece % 2
+            h ^= self.zobristTurn
+        self.hash = h
+
+    def evaluateLeaf(self, maximizer: int, depth: int, evaluate) -> int:
+        """Evaluate a leaf of the search, the evaluation functions of Checkers
+        are replaced by the versions of the bitboards (they give the same scores)
+
+        Args:
+            maximizer (int): the type of the maximizer player (WHITE, BLACK)
+            depth (int): the current depth of the algorithm
+            evaluate (Callable[[int], int]): evaluation function
+
+        Returns:
+            int: score of the board for the maximizer
+        """
+        return super().evaluateLeaf(maximizer, depth, EVALUATORS.get(evaluate, evaluate))
+
+    def evaluate1(self, maximizer: int) -> int:
+        """evaluate the current state of the board by the number of pieces
+
+        Args:
+            maximizer (int): the type of the maximizer player (WHITE, BLACK)
+
+        Returns:
+            int: score of the board
+        """
+        bb = self.bitboards
+        score = bb[self.WHITE_MAN].bit_count() + 2 * bb[self.WHITE_KING].bit_count() \
+            - bb[self.BLACK_MAN].bit_count() - 2 * bb[self.BLACK_KING].bit_count()
+        if maximizer == self.BLACK:
+            score = -score
+        return score * 1000
+
+    def endGame(self, maximizer: int) -> int:
+        """evaluate the current state of the board based on end game strategies
+            between maximizer player and the opponent, like Checkers.endGame
+
+        Args:
+            maximizer (int): the type of the maximizer player (WHITE, BLACK)
+
+        Returns:
+            int: score of the board
+        """
+        bb = self.bitboards
+        if maximizer == self.WHITE:
+            men, mine = bb[self.WHITE_MAN], bb[self.WHITE_MAN] | bb[self.WHITE_KING]
+            theirs = bb[self.BLACK_MAN] | bb[self.BLACK_KING]
+        else:
+            men, mine = bb[self.BLACK_MAN], bb[self.BLACK_MAN] | bb[self.BLACK_KING]
+            theirs = bb[self.WHITE_MAN] | bb[self.WHITE_KING]
+        maxPieces = mine.bit_count()
+        minPieces = theirs.bit_count()
+        score1 = self.evaluate1(maximizer) // 1000
+
+        # the sums of the coordinates of the pieces, counted by bit planes (see makeMasks)
+        sumI = sumJ = sumSquares = 0
+        sumX = sumY = minSquares = 0
+        rowScore = 0
+        for plane, weight in self.rowWeights:
+            sumI += weight * (mine & plane).bit_count()
+            sumX += weight * (theirs & plane).bit_count()
+            rowScore += weight * (men & plane).bit_count()
+        for plane, weight in self.columnWeights:
+            sumJ += weight * (mine & plane).bit_count()
+            sumY += weight * (theirs & plane).bit_count()
+        for plane, weight in self.squareWeights:
+            sumSquares += weight * (mine & plane).bit_count()
+            minSquares += weight * (theirs & plane).bit_count()
+        # the distance of the men to the base row
+        if maximizer == self.BLACK:
+            rowScore = (self.size-1) * men.bit_count() - rowScore
+        score2 = minPieces*sumSquares + maxPieces*minSquares - 2*(sumI*sumX + sumJ*sumY)
+
+        minimizerCorner = 1 if theirs & self.cornerMask else 0
+        maximizerCorner = 1 if mine & self.cornerMask else 0
+
+        if maxPieces > minPieces:   #come closer to opponent
+            return score1*1000 - score2 - minimizerCorner*5 + rowScore*10
+        else:    # run away
+            return score1*1000 + score2 + maximizerCorner*5
+
+    def evaluate2(self, maximizer: int, weights: Tuple[int, ...] = Checkers.EVALUATE2_WEIGHTS) -> int:
+        """evaluate the current state of the board with the features of Checkers.evaluate2,
+        every feature is the number of bits of a mask
+
+        Args:
+            maximizer (int): the type of the maximizer player (WHITE, BLACK)
+            weights (Tuple[int, ...], optional): the weights of the features. Defaults to EVALUATE2_WEIGHTS.
+
+        Returns:
+            int: score of the board
+        """
+        bb = self.bitboards
+        if maximizer == self.WHITE:
+            myMen, myKings, theirMen, theirKings = bb[1], bb[3], bb[2], bb[4]
+            myDir = 1
+        else:
+            myMen, myKings, theirMen, theirKings = bb[2], bb[4], bb[1], bb[3]
+            myDir = -1
+        mine = myMen | myKings
+        theirs = theirMen | theirKings
+        empty = self.full & ~(mine | theirs)
+
+        # a piece is vulnerable if an opponent piece next to it can jump over it to the empty square behind it,
+        # the men of the opponent only in the directions where they move
+        vulnerable = 0
+        for k in range(4):
+            s = self.shifts[k]
+            attackers = theirKings if self.DX[k] == myDir else theirs
+            vulnerable |= self.flankFrom[k] & self.shift(attackers, -s) & self.shift(empty, s)
+
+        myCount = mine.bit_count()
+        theirCount = theirs.bit_count()
+        myVulnerable = (mine & vulnerable).bit_count()
+        theirVulnerable = (theirs & vulnerable).bit_count()
+        men = myMen.bit_count() - theirMen.bit_count()
+        kings = myKings.bit_count() - theirKings.bit_count()
+        backRow = (mine & self.backRows[maximizer]).bit_count()
+        middleBox = (mine & self.middleBox).bit_count() - (theirs & self.middleBox).bit_count()
+        middleRow = (mine & self.middleRows).bit_count() - (theirs & self.middleRows).bit_count()
+        vulnerableCount = myVulnerable - theirVulnerable
+        protected = (myCount - myVulnerable) - (theirCount - theirVulnerable)
+
+        wMen, wKings, wBackRow, wMiddleBox, wMiddleRow, wVulnerable, wProtected = weights
+        return men*wMen + kings*wKings + backRow*wBackRow + middleBox*wMiddleBox + middleRow*wMiddleRow \
+            + vulnerableCount*wVulnerable + protected*wProtected
+
+    def stateValue(self, maximizer: int) -> int:
+        """get value of the board state, like Checkers.stateValue
+
+        Args:
+            maximizer (int): the type of the maximizer player (WHIET/BLACK)
+
+        Returns:
+            int: value of the board state
+        """
+        bb = self.bitboards
+        white = (bb[self.WHITE_MAN] | bb[self.WHITE_KING]).bit_count()
+        black = (bb[self.BLACK_MAN] | bb[self.BLACK_KING]).bit_count()
+        maxPieces, minPieces = (white, black) if maximizer == self.WHITE else (black, white)
+        if (maxPieces > minPieces):
+            return -self.stateCounter[self.encodeBoard()]
+        return 0
+
+
+# the evaluation functions of Checkers and their versions of the bitboards
+EVALUATORS: Dict = {
+    Checkers.evaluate1: BitboardCheckers.evaluate1,
+    Checkers.evaluate2: BitboardCheckers.evaluate2,
+    Checkers.endGame: BitboardCheckers.endGame,
+}
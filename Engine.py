@@ -0,0 +1,360 @@
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, List, TextIO, Tuple
+from Checkers import Checkers, Positions, SearchTimeout
+from BitboardCheckers import BitboardCheckers
+from Perft import PIECES
+from SearchStats import SearchStats
+from Tablebase import Tablebase
+from OpeningBook import OpeningBook
+
+PLAYERS = {"white": Checkers.WHITE, "black": Checkers.BLACK}
+
+HELP = """commands:
+  newgame [size]                     start a new game from the initial board, black to move
+  position start [black|white]       set the initial board and the player to move
+  position <black|white> <rows>      set a board, its rows are separated by / and every square is
+                                     . (empty), w / b (men) or W / B (kings), like .w.w/w.w./..../b.b.
+  moves <move> ...                   play moves, a move is the path of its piece like 5,0-4,1 or 5,0-3,2-1,0
+  go depth <n> | go time <seconds>   search the best move without playing it, it's printed as bestmove
+  stop                               stop the running search, the best move found so far is printed
+  stats [clear]                      print the statistics of the searches (even while searching) or clear them
+  isready                            print readyok, it's answered even while searching
+  quit                               stop the engine"""
+
+
+def formatMove(path: Positions) -> str:
+    """Write the path of a move in the notation of the protocol
+
+    Args:
+        path (Positions): the path of the move
+
+    Returns:
+        str: the move, like 5,0-4,1
+    """
+    return "-".join(f"{x},{y}" for x, y in path)
+
+
+def parseMove(text: str) -> Positions:
+    """Read a move in the notation of the protocol
+
+    Args:
+        text (str): the move, like 5,0-4,1
+
+    Returns:
+        Positions: the path of the move
+    """
+    return [tuple(int(c) for c in square.split(",")) for square in text.split("-")]
+
+
+def parsePlayer(name: str) -> int:
+    """Read the player to move in the notation of the protocol
+
+    Args:
+        name (str): black or white
+
+    Raises:
+        Exception: if it isn't a player
+
+    Returns:
+        int: the player (WHITE, BLACK)
+    """
+    if name not in PLAYERS:
+        raise Exception(f"unknown player {name}, it must be black or white")
+    return PLAYERS[name]
+
+
+def parseRows(text: str) -> List[List[int]]:
+    """Read a board in the notation of the protocol
+
+    Args:
+        text (str): the rows of the board separated by /, like .w.w/w.w./..../b.b.
+
+    Raises:
+        Exception: if the board isn't square, its size isn't even and greater than 3
+            or a square isn't one of . w b W B
+
+    Returns:
+        List[List[int]]: the board
+    """
+    rows = text.split("/")
+    if len(rows) % 2 != 0 or len(rows) < 4:
+        raise Exception(f"the board has {len(rows)} rows, the size of the board must be even and greater than 3")
+    for i, row in enumerate(rows):
+        if len(row) != len(rows):
+            raise Exception(f"row {i} has {len(row)} squares, every row must have {len(rows)} squares")
+        for square in row:
+            if square not in PIECES:
+                raise Exception(f"unknown square {square} in row {i}, it must be one of {' '.join(PIECES)}")
+    return [[PIECES[square] for square in row] for row in rows]
+
+
+class Engine(object):
+    """
+    long-lived engine that reads commands from a text stream and writes its answers to another one,
+    one command per line (see HELP). the game and its transposition table are kept between the moves
+    and the games, so the engine doesn't start cold every time.
+    the searches run in a thread, so stop can be read while searching
+    """
+
+    def __init__(
+        self,
+        size: int = 8,
+        ttSize: float = 64,
+        evaluate: Callable[[int], int] = Checkers.evaluate2,
+        quiescence: int = 0,
+        ordering: bool = True,
+        search: Callable[..., int] = Checkers.minimax,
+        tablebase: str = None,
+        openingBook: str = None,
+        output: TextIO = sys.stdout,
+    ) -> None:
+        """Make an engine
+
+        Args:
+            size (int, optional): size of the checkers board. Defaults to 8.
+            ttSize (float, optional): the memory of the transposition table in megabytes. Defaults to 64.
+            evaluate (Callable[[int], int], optional): evaluation function. Defaults to evaluate2.
+            quiescence (int, optional): the node limit of the quiescence search, 0 disables it. Defaults to 0.
+            ordering (bool, optional): order the moves by killer moves and history heuristic. Defaults to True.
+            search (Callable[..., int], optional): the search algorithm (minimax, pvs). Defaults to minimax.
+            tablebase (str, optional): the path of the endgame tablebase. Defaults to None.
+            openingBook (str, optional): the path of the opening book, its moves are played
+                whatever the evaluation function and the search of the engine are. Defaults to None.
+            output (TextIO, optional): the stream of the answers. Defaults to stdout.
+        """
+        self.ttSize = ttSize
+        self.evaluate = evaluate
+        self.quiescence = quiescence
+        self.ordering = ordering
+        self.search = search
+        self.tablebase = Tablebase(tablebase) if tablebase is not None else None
+        self.openingBook = OpeningBook(openingBook) if openingBook is not None else None
+        self.output = output
+        self.lock = threading.Lock()
+        self.stats = SearchStats()
+        self.worker = None
+        self.game = None
+        self.newGame(size)
+
+    def send(self, line: str):
+        """Write an answer, it's called by the main thread and the search thread
+
+        Args:
+            line (str): the answer
+        """
+        with self.lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def makeGame(self, size: int):
+        """Make the game of a board size, the game (and its transposition table) is kept while the size is the same
+
+        Args:
+            size (int): size of the checkers board
+        """
+        if self.game is not None and self.game.size == size:
+            return
+        self.game = BitboardCheckers(size, self.ttSize)
+        self.game.tablebase = self.tablebase
+        self.game.openingBook = self.openingBook
+        self.game.stats = self.stats
+
+    def newGame(self, size: int = None):
+        """Start a new game from the initial board, black moves first
+
+        Args:
+            size (int, optional): size of the checkers board. Defaults to the current size.
+        """
+        size = size or self.game.size
+        self.makeGame(size)
+        self.setPosition(Checkers.initialBoard(size), Checkers.BLACK)
+
+    def setPosition(self, board: List[List[int]], player: int):
+        """Set the board and the player to move, the repeated boards are forgotten
+        and the board is counted once, like at the start of minimaxPlay
+
+        Args:
+            board (List[List[int]]): the board
+            player (int): the player to move (WHITE, BLACK)
+        """
+        self.makeGame(len(board))
+        self.game.setBoard(board)
+        self.game.setTurn(player)
+        self.game.stateCounter = Counter([self.game.hash])
+        self.player = player
+
+    def playMoves(self, moves: List[str]):
+        """Play moves from the current board
+
+        Args:
+            moves (List[str]): the moves in the notation of the protocol
+
+        Raises:
+            Exception: if a move isn't valid, the moves before it are played
+        """
+        game = self.game
+        for text in moves:
+            path = parseMove(text)
+            if not any(path == move for move, _, _ in game.nextSequences(self.player)):
+                raise Exception(f"illegal move {text}")
+            # playSequence gives the turn to the next player, so the board is counted twice with the same key,
+            # which is the count minimaxPlay has when the search of the next player starts
+            # (after counting the board of its move and counting it again before searching)
+            game.playSequence(path)
+            game.stateCounter[game.encodeBoard()] += 2
+            self.player = 1 - self.player
+
+    def go(self, maxDepth: int = None, timeLimit: float = None):
+        """Start searching the best move of the current board in the search thread
+
+        Args:
+            maxDepth (int, optional): the max depth of the search. Defaults to None.
+            timeLimit (float, optional): the time budget of the search in seconds. Defaults to None.
+        """
+        self.game.stopped = False
+        self.worker = threading.Thread(target=self.think, args=(maxDepth, timeLimit), daemon=True)
+        self.worker.start()
+
+    def think(self, maxDepth: int, timeLimit: float):
+        """Search the best move and print it, it runs in the search thread.
+        with a max depth the search is deepened one ply at a time (the table keeps it cheap),
+        so stop gives the move of the deepest completed depth
+
+        Args:
+            maxDepth (int): the max depth of the search, None to search until the time is over
+            timeLimit (float): the time budget of the search in seconds, None for no limit
+        """
+        game, player = self.game, self.player
+        moves = game.nextSequences(player)
+        if len(moves) == 0:
+            self.send("bestmove none")
+            return
+        start = time.perf_counter()
+        best = None
+        bookMove = game.bookMove(moves)
+        if bookMove is not None:
+            best = (None, bookMove)
+        elif timeLimit is not None:
+            try:
+                best = self.searchBestMove(moves, self.game.MAX_SEARCH_DEPTH, timeLimit)
+            except SearchTimeout:
+                pass
+        else:
+            for depth in range(1, maxDepth + 1):
+                try:
+                    best = self.searchBestMove(list(moves), depth, None)
+                except SearchTimeout:
+                    break
+                self.send(f"info depth {depth} score {best[0]} move {formatMove(best[1])}")
+                if game.stopped:
+                    break
+        if best is None:
+            # stopped before any completed depth
+            best = (None, moves[0][0])
+        value, path = best
+        self.stats.addMove(time.perf_counter() - start)
+        self.send(f"bestmove {formatMove(path)}" + (f" score {value}" if value is not None else ""))
+
+    def searchBestMove(self, moves, maxDepth: int, timeLimit: float) -> Tuple[int, Positions]:
+        """Search the best move with the options of the engine
+
+        Args:
+            moves (Sequences): the moves of the player to move
+            maxDepth (int): the max depth of the search
+            timeLimit (float): the time budget of the search in seconds, None for no limit
+
+        Returns:
+            bestValue (int): score of the best move.
+            bestMove (Positions): the path of the best move.
+        """
+        return self.game.searchBestMove(
+            self.player, moves, maxDepth, self.evaluate, timeLimit,
+            quiescence=self.quiescence, ordering=self.ordering, search=self.search
+        )
+
+    def stop(self):
+        """Stop the running search and wait for its move"""
+        if self.worker is not None:
+            self.game.stopped = True
+            self.worker.join()
+            self.worker = None
+
+    def wait(self):
+        """Wait for the running search to end, the board must not change while it's searched"""
+        if self.worker is not None:
+            self.worker.join()
+            self.worker = None
+
+    def handle(self, line: str) -> bool:
+        """Run a command
+
+        Args:
+            line (str): the command
+
+        Returns:
+            bool: false if the engine must quit
+        """
+        words = line.split()
+        if len(words) == 0:
+            return True
+        command, args = words[0], words[1:]
+        if command == "quit":
+            self.stop()
+            return False
+        if command == "stop":
+            self.stop()
+            return True
+        # isready and stats are answered while searching, the other commands wait for the search
+        if command == "isready":
+            self.send("readyok")
+            return True
+        if command == "stats" and len(args) == 0:
+            for statsLine in self.stats.summary().split("\n"):
+                self.send(f"info {statsLine}")
+            return True
+        self.wait()
+        try:
+            if command == "newgame":
+                self.newGame(int(args[0]) if len(args) > 0 else None)
+            elif command == "position" and len(args) > 0 and args[0] == "start":
+                player = parsePlayer(args[1] if len(args) > 1 else "black")
+                self.setPosition(Checkers.initialBoard(self.game.size), player)
+            elif command == "position" and len(args) == 2:
+                player = parsePlayer(args[0])
+                self.setPosition(parseRows(args[1]), player)
+            elif command == "moves":
+                self.playMoves(args)
+            elif command == "go" and len(args) == 2 and args[0] == "depth":
+                self.go(maxDepth=int(args[1]))
+            elif command == "go" and len(args) == 2 and args[0] == "time":
+                self.go(timeLimit=float(args[1]))
+            elif command == "stats" and args[0] == "clear":
+                self.stats.clear()
+            elif command == "help":
+                self.send(HELP)
+            else:
+                raise Exception(f"unknown command {line.strip()}")
+        except Exception as e:
+            self.send(f"error {e}")
+        return True
+
+    def run(self, input: TextIO = sys.stdin):
+        """Read and run commands until quit or the end of the input
+
+        Args:
+            input (TextIO, optional): the stream of the commands. Defaults to stdin.
+        """
+        for line in input:
+            if not self.handle(line):
+                return
+        self.wait()
+
+
+if __name__ == "__main__":
+    # python Engine.py [transposition table size in megabytes] [tablebase file]
+    ttSize = float(sys.argv[1]) if len(sys.argv) > 1 else 64
+    tablebase = sys.argv[2] if len(sys.argv) > 2 else None
+    Engine(ttSize=ttSize, tablebase=tablebase).run()
@@ -1,7 +1,13 @@
+import queue
+import threading
 import tkinter as tk
+from collections import Counter
 from tkinter import messagebox
 from PIL import ImageTk, Image
-from Checkers import Checkers, Positions
+from Checkers import Checkers, Positions, SearchTimeout
+from Tablebase import Tablebase
+from OpeningBook import OpeningBook
+from GameRecord import GameRecord
 from enum import Enum
 
 window = tk.Tk()
@@ -27,6 +33,17 @@ USED_ALGORITHM = Algorithm.MINIMAX
 MAX_DEPTH = 5
 EVALUATION_FUNCTION = Checkers.evaluate2
 INCREASE_DEPTH = True
+TT_SIZE = 64
+TIME_LIMIT = None
+QUIESCENCE = 0
+MOVE_ORDERING = False
+SEARCH_ALGORITHM = Checkers.minimax
+ASPIRATION = 0
+TABLEBASE_FILE = None
+OPENING_BOOK_FILE = None
+PONDER = True
+POLL_INTERVAL = 50
+SNAPSHOT_INTERVAL = 20
 
 def from_rgb(rgb):
     """translates an rgb tuple of int to a tkinter friendly color code
@@ -39,19 +56,22 @@ class GUI:
     def __init__(self) -> None:
         super().__init__()
         self.game = Checkers(CHECKER_SIZE)
-        self.history = [self.game.getBoard()]
-        self.historyPtr = 0
+        # the computer searches on its own copy of the game in a worker thread,
+        # so the window keeps responding and the transposition table is kept between the moves
+        self.engine = Checkers(CHECKER_SIZE, TT_SIZE)
+        if TABLEBASE_FILE is not None:
+            self.engine.tablebase = Tablebase(TABLEBASE_FILE)
+        if OPENING_BOOK_FILE is not None:
+            self.engine.openingBook = OpeningBook(OPENING_BOOK_FILE)
+        self.worker = None
+        self.results = queue.Queue()
+        self.searchId = 0
+        self.thinking = False
+        self.record = GameRecord(self.game, SNAPSHOT_INTERVAL)
 
         self.maxDepth = MAX_DEPTH
 
         self.player = STARTING_PLAYER
-        if self.player == Checkers.WHITE and GAME_MODE == Mode.SINGLE_PLAYER:
-            if USED_ALGORITHM == Algorithm.MINIMAX:
-                self.game.minimaxPlay(1-self.player, maxDepth=self.maxDepth, evaluate=EVALUATION_FUNCTION, enablePrint=False)
-            elif USED_ALGORITHM == Algorithm.RANDOM:
-                self.game.randomPlay(1-self.player, enablePrint=False)
-            self.history = [self.game.getBoard()]
-        
         self.lastX = None
         self.lastY = None
         self.willCapture = False
@@ -85,10 +105,21 @@ class GUI:
         frm_counter.pack(expand=True)
         self.lbl_counter = tk.Label(master=frm_counter)
         self.lbl_counter.pack()
+        self.lbl_status = tk.Label(master=frm_counter)
+        self.lbl_status.pack()
+        window.protocol("WM_DELETE_WINDOW", self.close)
 
         self.update()
-        nextPositions = [move[0] for move in self.game.nextMoves(self.player)]
-        self.highlight(nextPositions)
+        if self.player == Checkers.WHITE and GAME_MODE == Mode.SINGLE_PLAYER:
+            if USED_ALGORITHM == Algorithm.MINIMAX:
+                self.startThinking(restart=True)
+            elif USED_ALGORITHM == Algorithm.RANDOM:
+                self.randomMove()
+                self.record = GameRecord(self.game, SNAPSHOT_INTERVAL)
+                self.update()
+        if not self.thinking:
+            nextPositions = [move[0] for move in self.game.nextMoves(self.player)]
+            self.highlight(nextPositions)
         window.mainloop()
 
     def update(self):
@@ -127,6 +158,8 @@ class GUI:
             self.btn[x][y].master.config(highlightbackground="yellow", highlightthickness=3)
 
     def click(self, event):
+        if self.thinking:
+            return
         info = event.widget.master.grid_info()
         x, y = info["row"], info["column"]
         if self.lastX == None or self.lastY == None:
@@ -154,7 +187,7 @@ class GUI:
                 self.highlight(nextPositions)
             return
 
-        canCapture, removed, _ = self.game.playMove(self.lastX, self.lastY, x, y)
+        canCapture, removed, _ = self.record.playMove(self.lastX, self.lastY, x, y)
         self.highlight([])
         self.update()
         self.cnt += 1
@@ -174,34 +207,165 @@ class GUI:
                 return
 
         if GAME_MODE == Mode.SINGLE_PLAYER:
-            cont, reset = True, False
             if USED_ALGORITHM == Algorithm.MINIMAX:
-                evaluate = EVALUATION_FUNCTION
-                if self.cnt > 20:
-                    evaluate = Checkers.endGame
-                    if INCREASE_DEPTH:
-                        self.maxDepth = 7
-                else:
-                    evaluate = Checkers.evaluate2
-                    self.maxDepth = MAX_DEPTH
-                    
-                cont, reset = self.game.minimaxPlay(1-self.player, maxDepth=self.maxDepth, evaluate=evaluate, enablePrint=False)
-            elif USED_ALGORITHM == Algorithm.RANDOM:
-                cont, reset = self.game.randomPlay(1-self.player, enablePrint=False)
-            self.cnt += 1
-            if not cont:
-                messagebox.showinfo(message="You Won!", title="Checkers")
-                window.destroy()
+                self.startThinking()
                 return
-            self.update()
-            if reset:
-                self.cnt = 0
+            cont, reset = self.randomMove()
+            self.computerPlayed(cont, reset)
         else:
             self.player = 1-self.player
+            self.endTurn()
+
+    def randomMove(self):
+        """Play a random move of the computer
+
+        Returns:
+            continue (bool): false if the computer has no moves.
+            reset (bool): true when the computer captured a piece.
+        """
+        self.engine.setBoard(self.game.getBoard())
+        cont, reset = self.engine.randomPlay(1-self.player, enablePrint=False)
+        if cont:
+            self.record.playSequence(self.engine.lastMove)
+        return cont, reset
+
+    def startThinking(self, restart=False):
+        """Start searching the move of the computer in the worker thread
+
+        Args:
+            restart (bool, optional): if true the history starts after the move of the computer. Defaults to False.
+        """
+        self.stopWorker()
+        evaluate = EVALUATION_FUNCTION
+        if self.cnt > 20:
+            evaluate = Checkers.endGame
+            if INCREASE_DEPTH:
+                self.maxDepth = 7
+        else:
+            evaluate = Checkers.evaluate2
+            self.maxDepth = MAX_DEPTH
+
+        self.thinking = True
+        self.lbl_status['text'] = 'Thinking...'
+        window.config(cursor='watch')
+        self.engine.stopped = False
+        self.worker = threading.Thread(
+            target=self.think,
+            args=(self.searchId, self.game.getBoard(), Counter(self.game.stateCounter), self.maxDepth, evaluate),
+            daemon=True,
+        )
+        self.worker.start()
+        window.after(POLL_INTERVAL, self.poll, self.searchId, restart)
+
+    def think(self, searchId, board, stateCounter, maxDepth, evaluate):
+        """Play the move of the computer on the engine, it runs in the worker thread,
+        then it ponders on the predicted reply until it's stopped
+
+        Args:
+            searchId (int): the id of the search, the result of a cancelled search is ignored
+            board (Board): the board of the game
+            stateCounter (Counter): the number of times every board is reached
+            maxDepth (int): the max depth of the search
+            evaluate (Callable[[int], int]): evaluation function
+        """
+        engine = self.engine
+        computer = 1-self.player
+        engine.setBoard(board)
+        engine.stateCounter = stateCounter
+        options = dict(
+            maxDepth=maxDepth, evaluate=evaluate, quiescence=QUIESCENCE, ordering=MOVE_ORDERING,
+            search=SEARCH_ALGORITHM, aspiration=ASPIRATION
+        )
+        try:
+            cont, reset = engine.minimaxPlay(computer, enablePrint=False, timeLimit=TIME_LIMIT, **options)
+        except SearchTimeout:
+            return
+        self.results.put((searchId, cont, reset, engine.lastMove if cont else None, Counter(engine.stateCounter)))
+
+        tt = engine.transpositionTable
+        if not PONDER or not cont or tt is None:
+            return
+        # the reply that the computer expects is the best move of the last search
+        entry = tt.probe(engine.hash ^ engine.searchKey(computer, evaluate))
+        if entry is None or entry[4] is None:
+            return
+        engine.playSequence(entry[4])
+        moves = engine.nextSequences(computer)
+        if len(moves) == 0:
+            return
+        try:
+            # the result is kept in the transposition table for the next search
+            engine.searchBestMove(computer, moves, **options)
+        except SearchTimeout:
+            pass
+
+    def poll(self, searchId, restart):
+        """Check if the worker thread found the move of the computer, and play it
+
+        Args:
+            searchId (int): the id of the search
+            restart (bool): if true the history starts after the move of the computer
+        """
+        if searchId != self.searchId:
+            return
+        try:
+            resultId, cont, reset, path, stateCounter = self.results.get_nowait()
+        except queue.Empty:
+            window.after(POLL_INTERVAL, self.poll, searchId, restart)
+            return
+        if resultId != searchId:
+            window.after(POLL_INTERVAL, self.poll, searchId, restart)
+            return
+
+        self.thinking = False
+        self.lbl_status['text'] = ''
+        window.config(cursor='')
+        if cont:
+            self.record.playSequence(path)
+        self.game.stateCounter = stateCounter
+        self.computerPlayed(cont, reset, restart)
+
+    def stopWorker(self):
+        """Stop the search or the pondering of the worker thread, and ignore its result"""
+        self.searchId += 1
+        if self.worker is not None:
+            self.engine.stopped = True
+            self.worker.join()
+            self.worker = None
+        if self.thinking:
+            self.thinking = False
+            self.lbl_status['text'] = ''
+            window.config(cursor='')
+
+    def computerPlayed(self, cont, reset, restart=False):
+        """Continue the game after the move of the computer
+
+        Args:
+            cont (bool): false if the computer has no moves
+            reset (bool): true when the computer captured a piece
+            restart (bool, optional): if true the history starts after the move of the computer. Defaults to False.
+        """
+        if restart:
+            self.update()
+            self.record = GameRecord(self.game, SNAPSHOT_INTERVAL)
+            nextPositions = [move[0] for move in self.game.nextMoves(self.player)]
+            self.highlight(nextPositions)
+            return
+        self.cnt += 1
+        if not cont:
+            messagebox.showinfo(message="You Won!", title="Checkers")
+            self.close()
+            return
+        self.update()
+        if reset:
+            self.cnt = 0
+        self.endTurn()
 
+    def endTurn(self):
+        """Check the end of the game and give the turn to the next player"""
         if self.cnt >= 100:
             messagebox.showinfo(message="Draw!", title="Checkers")
-            window.destroy()
+            self.close()
             return
         
         nextPositions = [move[0] for move in self.game.nextMoves(self.player)]
@@ -212,16 +376,29 @@ class GUI:
             else:
                 winner = "BLACK" if self.player == Checkers.WHITE else "WHITE"
                 messagebox.showinfo(message=f"{winner} Player won!", title="Checkers")
-            window.destroy()
+            self.close()
+            return
 
-        self.history = self.history[:self.historyPtr+1]
-        self.history.append(self.game.getBoard())
-        self.historyPtr += 1
+        self.record.endTurn()
+
+    def close(self):
+        """Stop the worker thread and close the window"""
+        self.searchId += 1
+        self.engine.stopped = True
+        window.destroy()
 
     def undo(self):
-        if self.historyPtr > 0 and not self.willCapture:
-            self.historyPtr -= 1
-            self.game.setBoard(self.history[self.historyPtr])
+        if self.thinking:
+            # cancel the search and take back the move of the player
+            self.stopWorker()
+            self.record.cancelTurn()
+            self.update()
+
+            self.lastX = self.lastY = None
+            nextPositions = [move[0] for move in self.game.nextMoves(self.player)]
+            self.highlight(nextPositions)
+        elif self.record.canUndo():
+            self.record.undo()
             self.update()
 
             self.lastX = self.lastY = None
@@ -231,9 +408,8 @@ class GUI:
             print("Can't undo")
     
     def redo(self):
-        if self.historyPtr < len(self.history)-1 and not self.willCapture:
-            self.historyPtr += 1
-            self.game.setBoard(self.history[self.historyPtr])
+        if self.record.canRedo() and not self.thinking:
+            self.record.redo()
             self.update()
 
             self.lastX = self.lastY = None
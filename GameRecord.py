@@ -0,0 +1,113 @@
+from typing import Dict, List, Tuple
+from Checkers import Checkers, Board, Positions
+
+# the positions of a single step (x, y, nx, ny), the removed piece and if the piece is promoted
+Delta = Tuple[int, int, int, int, int, bool]
+
+
+class GameRecord(object):
+    """
+    record of the played turns of a game as the steps of their moves,
+    the turns are undone and replayed with playMove and undoMove,
+    and a snapshot of the board and the player to move is kept every few turns to go to any turn quickly
+    """
+
+    def __init__(self, game: Checkers, snapshotInterval: int = 20) -> None:
+        """Start recording a game from its current board
+
+        Args:
+            game (Checkers): the game
+            snapshotInterval (int, optional): the number of turns between the snapshots. Defaults to 20.
+        """
+        self.game = game
+        self.snapshotInterval = snapshotInterval
+        self.turns: List[List[Delta]] = []
+        # the steps of the turn that isn't completed yet
+        self.pending: List[Delta] = []
+        # the number of turns played on the board, the later turns can be replayed (redo)
+        self.current = 0
+        # the board and the player to move (Checkers.turn, a part of the hash) after every few turns
+        self.snapshots: Dict[int, Tuple[Board, int]] = {0: (game.getBoard(), game.turn)}
+
+    def playMove(self, x: int, y: int, nx: int, ny: int) -> Tuple[bool, int, bool]:
+        """Play a single step on the game and record it in the current turn
+
+        Args:
+            x (int): the old x coordinate
+            y (int): the old y coordinate
+            nx (int): the new x coordinate
+            ny (int): the new y coordinate
+
+        Returns:
+            canCapture (bool): if the player can capture more pieces.
+            removed (int): the removed piece (0 if there is no removed pieces).
+            promoted (bool): if the piece is promoted.
+        """
+        canCapture, removed, promoted = self.game.playMove(x, y, nx, ny)
+        self.pending.append((x, y, nx, ny, removed, promoted))
+        return canCapture, removed, promoted
+
+    def playSequence(self, path: Positions):
+        """Play a complete move on the game and record it in the current turn
+
+        Args:
+            path (Positions): the path of the played piece
+        """
+        for i in range(len(path) - 1):
+            self.playMove(*path[i], *path[i + 1])
+
+    def cancelTurn(self):
+        """Undo the steps of the turn that isn't completed yet"""
+        for delta in reversed(self.pending):
+            self.game.undoMove(*delta)
+        self.pending = []
+
+    def endTurn(self):
+        """Complete the current turn, the undone turns can't be replayed anymore"""
+        del self.turns[self.current:]
+        for turn in [turn for turn in self.snapshots if turn > self.current]:
+            del self.snapshots[turn]
+        self.turns.append(self.pending)
+        self.pending = []
+        self.current += 1
+        if self.current % self.snapshotInterval == 0:
+            self.snapshots[self.current] = (self.game.getBoard(), self.game.turn)
+
+    def canUndo(self) -> bool:
+        """Check if there is a turn to undo"""
+        return self.current > 0 and len(self.pending) == 0
+
+    def canRedo(self) -> bool:
+        """Check if there is an undone turn to replay"""
+        return self.current < len(self.turns) and len(self.pending) == 0
+
+    def undo(self):
+        """Undo the last played turn"""
+        for delta in reversed(self.turns[self.current - 1]):
+            self.game.undoMove(*delta)
+        self.current -= 1
+
+    def redo(self):
+        """Replay the last undone turn"""
+        for x, y, nx, ny, _, _ in self.turns[self.current]:
+            self.game.playMove(x, y, nx, ny)
+        self.current += 1
+
+    def goTo(self, turn: int):
+        """Set the board of the game to its board after the given number of turns,
+        it starts from the closest snapshot if it's closer than the current board
+
+        Args:
+            turn (int): the number of turns, from 0 to the number of recorded turns
+        """
+        self.cancelTurn()
+        snapshot = max(t for t in self.snapshots if t <= turn)
+        if abs(turn - self.current) > turn - snapshot:
+            board, player = self.snapshots[snapshot]
+            self.game.setBoard(board)
+            self.game.setTurn(player)
+            self.current = snapshot
+        while self.current > turn:
+            self.undo()
+        while self.current < turn:
+            self.redo()
@@ -1,57 +1,25 @@
 from Checkers import Checkers
+from Tournament import PlayerConfig, Tournament
 
-wins = 0
-draws = 0
-games = 200
+GAMES = 200
+SEED = 0
 START_PLAYER = Checkers.BLACK
+STATS = False
 
-for i in range(games):
-    game = Checkers()
-    # game.printBoard()
-    player = START_PLAYER
-    cnt = 0
-    # statesCounter = {}
-    # state = None
-    while cnt < 100:
-        # state = game.encodeBoard()
-        # if state not in statesCounter:
-        #     statesCounter[state] = 0
-        # statesCounter[state] += 1
-        # # the exact same state repeated 3 times -> draw
-        # if statesCounter[state] == 3:
-        #     print("state repeated 3 times")
-        #     break
-        evaluator1 = Checkers.evaluate1
-        evaluator2 = Checkers.evaluate2
-        if cnt > 25:
-            evaluator1 = evaluator2 = Checkers.endGame
+if __name__ == "__main__":
+    first = PlayerConfig(evaluate=Checkers.evaluate1, maxDepth=3)
+    second = PlayerConfig(evaluate=Checkers.evaluate2, maxDepth=3)
+    tournament = Tournament(first, second, games=GAMES, seed=SEED, startPlayer=START_PLAYER, stats=STATS)
 
-        if player == START_PLAYER:
-            cont, reset = game.minimaxPlay(player, maxDepth=3, evaluate=evaluator1, enablePrint=False)
-            if not cont:
-                break
-        else:
-            cont, reset = game.minimaxPlay(player, maxDepth=3, evaluate=evaluator2, enablePrint=False)
-            if not cont:
-                break
+    for i, (index, result, plies) in enumerate(tournament.run()):
+        # print(f"game {index}: {result} after {plies} moves")
+        print(i, end='\r')
 
-        player = 1-player
-        cnt += 1
-        if reset:
-            cnt = 0
-
-    # if stateCounter[state] == 3:
-    #     print("Draw")
-    #     draws += 1
-
-    if cnt == 100:
-        # print("Draw")
-        draws += 1
-    else:
-        # print (("WHITE" if player == Checkers.BLACK else "BLACK") + " Player wins")
-        if player != START_PLAYER:
-            wins += 1
-    print(i, end='\r')
-
-loses = games - wins - draws
-print(f"total wins of {wins}/{games}, draws of {draws}/{games} and loses of {loses}/{games}")
+    wins, draws, loses = tournament.wins, tournament.draws, tournament.loses
+    print(f"total wins of {wins}/{GAMES}, draws of {draws}/{GAMES} and loses of {loses}/{GAMES}")
+    print(tournament.summary())
+    if STATS:
+        print("first player search statistics:")
+        print(tournament.firstStats.summary())
+        print("second player search statistics:")
+        print(tournament.secondStats.summary())
@@ -0,0 +1,94 @@
+from typing import Dict, List, Tuple
+
+Positions = List[Tuple[int, int]]
+Sequences = List[Tuple[Positions, Positions, bool]]
+
+
+class MoveOrdering(object):
+    """
+    orders the moves of minimax so that the best moves are searched first:
+    the move of the transposition table, then captures, then killer moves (the quiet moves
+    that caused a cutoff at the same depth) and then the other moves by their history score
+    """
+
+    KILLERS = 2
+    TT_SCORE = 1 << 60
+    CAPTURE_SCORE = 1 << 50
+    KILLER_SCORE = 1 << 40
+
+    def __init__(self, size: int) -> None:
+        """Make empty killer and history tables
+
+        Args:
+            size (int): size of the checkers board
+        """
+        self.size = size
+        # the history score of every (from, to) square of the moves that caused a cutoff,
+        # only those moves are kept, so it stays small on large boards
+        self.history: Dict[Tuple[int, int], int] = {}
+        self.clearKillers()
+
+    def clearKillers(self):
+        """Remove the killer moves, the depths of a new search don't match the old ones"""
+        self.killers = []
+
+    def age(self):
+        """Halve the history scores, so that the recent searches matter more"""
+        self.history = {key: score >> 1 for key, score in self.history.items() if score > 1}
+
+    def killerMoves(self, depth: int) -> List[Positions]:
+        """Get the killer moves of a depth
+
+        Args:
+            depth (int): the depth of the node
+
+        Returns:
+            List[Positions]: the paths of the killer moves
+        """
+        return self.killers[depth] if depth < len(self.killers) else []
+
+    def order(self, moves: Sequences, depth: int, ttMove: Positions = None):
+        """Sort the moves of a node by their expected quality
+
+        Args:
+            moves (Sequences): the moves to sort
+            depth (int): the depth of the node
+            ttMove (Positions, optional): the path of the move of the transposition table. Defaults to None.
+        """
+        killers = self.killerMoves(depth)
+        size = self.size
+
+        def score(move):
+            path, captured, _ = move
+            if path == ttMove:
+                return self.TT_SCORE
+            if len(captured) != 0:
+                return self.CAPTURE_SCORE + len(captured)
+            if path in killers:
+                return self.KILLER_SCORE
+            (x, y), (nx, ny) = path[0], path[-1]
+            return self.history.get((x * size + y, nx * size + ny), 0)
+
+        moves.sort(key=score, reverse=True)
+
+    def cutoff(self, move: Positions, captured: Positions, depth: int, remaining: int):
+        """Record a move that caused a beta cutoff
+
+        Args:
+            move (Positions): the path of the move
+            captured (Positions): the captured pieces of the move
+            depth (int): the depth of the node
+            remaining (int): the remaining depth searched below the node
+        """
+        # captures are already searched first
+        if len(captured) != 0:
+            return
+        while len(self.killers) <= depth:
+            self.killers.append([])
+        killers = self.killers[depth]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[self.KILLERS:]
+        (x, y), (nx, ny) = move[0], move[-1]
+        key = (x * self.size + y, nx * self.size + ny)
+        self.history[key] = self.history.get(key, 0) + remaining * remaining
@@ -0,0 +1,153 @@
+from typing import List, Tuple
+from Checkers import Checkers, Board, Sequences
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def boardsToArray(boards: List[Board]) -> "np.ndarray":
+    """Convert boards of the same size to an array
+
+    Args:
+        boards (List[Board]): the boards
+
+    Returns:
+        np.ndarray: int8 array of shape (number of boards, size, size)
+    """
+    return np.array(boards, dtype=np.int8).reshape(len(boards), len(boards[0]), len(boards[0]))
+
+
+class NumpyEvaluator(object):
+    """
+    evaluate2 computed with array operations on int8 boards, it gives the same scores as Checkers.evaluate2.
+    it's made for offline analysis (like Tuner) of large arrays of positions with evaluateBatch and features,
+    which are faster than evaluate2 from a few hundred boards per call.
+    the search shouldn't use it: a single board (evaluator(game, maximizer)) or the children of a single node
+    (evaluateChildren) are too few boards to pay for the calls of numpy, and they are slower than evaluate2
+    """
+
+    FEATURES = ("men", "kings", "backRow", "middleBox", "middleRow", "vulnerable", "protected")
+
+    # the masks of every board size
+    MASKS = {}
+
+    def __init__(self, weights: Tuple[int, ...] = Checkers.EVALUATE2_WEIGHTS) -> None:
+        """Make an evaluator
+
+        Args:
+            weights (Tuple[int, ...], optional): the weight of every feature. Defaults to the weights of evaluate2.
+        """
+        if np is None:
+            raise Exception("NumpyEvaluator needs numpy, install it with `pip install numpy`")
+        if len(weights) != len(self.FEATURES):
+            raise Exception(f"Expected {len(self.FEATURES)} weights, got {len(weights)}")
+        self.weights = np.array(weights, dtype=np.int64)
+
+    def masks(self, size: int) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Get the masks of the middle squares of a board size
+
+        Args:
+            size (int): size of the checkers board
+
+        Returns:
+            middleBox: the squares of the middle rows in the middle 4 columns.
+            middleRow: the other squares of the middle rows.
+        """
+        if size not in self.MASKS:
+            rows = np.arange(size)[:, None]
+            columns = np.arange(size)[None, :]
+            middle = (rows == size/2-1) | (rows == size/2)
+            box = (columns >= size/2-2) & (columns < size/2+2)
+            self.MASKS[size] = (middle & box, middle & ~box)
+        return self.MASKS[size]
+
+    def features(self, boards: "np.ndarray", maximizers: "np.ndarray") -> "np.ndarray":
+        """Compute the features of evaluate2 for many boards
+
+        Args:
+            boards (np.ndarray): int8 array of shape (number of boards, size, size)
+            maximizers (np.ndarray): the maximizer player (WHITE, BLACK) of every board
+
+        Returns:
+            np.ndarray: int64 array of shape (number of boards, number of features)
+        """
+        count, size = boards.shape[0], boards.shape[1]
+        maximizers = np.broadcast_to(np.asarray(maximizers, dtype=np.int8), (count,))[:, None, None]
+        occupied = boards != 0
+        mine = occupied & (boards % 2 == maximizers)
+        sign = mine.astype(np.int64) - (occupied & ~mine)
+        kingMask = boards > 2
+
+        backRows = np.where(maximizers[:, 0, 0] == Checkers.WHITE, 0, size - 1)
+        backRow = mine[np.arange(count), backRows].sum(axis=1)
+
+        middleBox, middleRow = self.masks(size)
+
+        # the squares outside of the board are -1, so the neighbours of every square are slices
+        padded = np.pad(boards, ((0, 0), (1, 1), (1, 1)), constant_values=-1)
+        myDir = np.where(maximizers == Checkers.WHITE, 1, -1)
+        vul = np.zeros(boards.shape, dtype=bool)
+        for dx, dy in zip(Checkers.DX, Checkers.DY):
+            neighbour = padded[:, 1+dx:1+dx+size, 1+dy:1+dy+size]
+            opposite = padded[:, 1-dx:1-dx+size, 1-dy:1-dy+size]
+            vul |= (neighbour > 0) & (neighbour % 2 != maximizers) & (opposite == 0) \
+                & ((neighbour > 2) | (myDir != dx))
+
+        return np.stack([
+            (sign * ~kingMask).sum(axis=(1, 2)),
+            (sign * kingMask).sum(axis=(1, 2)),
+            backRow,
+            (sign * middleBox).sum(axis=(1, 2)),
+            (sign * middleRow).sum(axis=(1, 2)),
+            (sign * vul).sum(axis=(1, 2)),
+            (sign * ~vul).sum(axis=(1, 2)),
+        ], axis=1)
+
+    def evaluateBatch(self, boards: "np.ndarray", maximizers: "np.ndarray") -> "np.ndarray":
+        """Evaluate many boards in one call
+
+        Args:
+            boards (np.ndarray): int8 array of shape (number of boards, size, size)
+            maximizers (np.ndarray): the maximizer player (WHITE, BLACK) of every board, or one player for all of them
+
+        Returns:
+            np.ndarray: the score of every board
+        """
+        return self.features(boards, maximizers) @ self.weights
+
+    def evaluateChildren(self, game: Checkers, player: int, maximizer: int, moves: Sequences = None) -> "np.ndarray":
+        """Evaluate the boards after every move of the player in one call,
+        it's slower than playing every move and calling evaluate2, it's only convenient for analysis
+
+        Args:
+            game (Checkers): the game
+            player (int): the type of player that plays the moves (WHITE, BLACK)
+            maximizer (int): the type of the maximizer player (WHITE, BLACK)
+            moves (Sequences, optional): the moves. Defaults to all the moves of the player.
+
+        Returns:
+            np.ndarray: the score of the board after every move
+        """
+        if moves is None:
+            moves = game.nextSequences(player)
+        boards = np.empty((len(moves), game.size, game.size), dtype=np.int8)
+        for index, (path, _, _) in enumerate(moves):
+            removed, promoted = game.playSequence(path)
+            boards[index] = game.board
+            game.undoSequence(path, removed, promoted)
+        return self.evaluateBatch(boards, maximizer)
+
+    def __call__(self, game: Checkers, maximizer: int) -> int:
+        """Evaluate the current board of a game, like Checkers.evaluate2
+
+        Args:
+            game (Checkers): the game
+            maximizer (int): the type of the maximizer player (WHITE, BLACK)
+
+        Returns:
+            int: score of the board
+        """
+        boards = np.array(game.board, dtype=np.int8)[None]
+        return int(self.evaluateBatch(boards, maximizer)[0])
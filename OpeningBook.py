@@ -0,0 +1,138 @@
+import mmap
+import random
+import struct
+import sys
+from typing import Callable, Dict, Optional, Tuple
+from Checkers import Checkers, Positions
+from BitboardCheckers import BitboardCheckers
+
+MAGIC = b"CKB2"
+HEADER = struct.Struct("<4sBI")
+MAX_PATH = 12
+# the hash of the board with its turn, the score, the length of the path of the best move
+# and its squares (x * size + y), 2 bytes each so that every board size fits
+RECORD = struct.Struct(f"<QqB{MAX_PATH}H")
+
+
+def build(
+    path: str,
+    plies: int = 4,
+    maxDepth: int = 6,
+    size: int = 8,
+    evaluate: Callable[[int], int] = Checkers.evaluate2,
+    search: Callable[..., int] = Checkers.minimax,
+    ttSize: float = 64,
+    enablePrint: bool = True,
+):
+    """Search the best move of every board reached in the first plies of the game
+    (by any moves and starting by any player) and write them to a file.
+    the moves are searched with the evaluation function and the search algorithm given here,
+    a game with the book plays them whatever its own settings are (see PlayerConfig.openingBook)
+
+    Args:
+        path (str): the path of the file
+        plies (int, optional): the number of plies of the book. Defaults to 4.
+        maxDepth (int, optional): the max depth of the searches. Defaults to 6.
+        size (int, optional): size of the checkers board. Defaults to 8.
+        evaluate (Callable[[int], int], optional): evaluation function. Defaults to evaluate2.
+        search (Callable[..., int], optional): the search algorithm (minimax, pvs). Defaults to minimax.
+        ttSize (float, optional): the memory of the transposition table in megabytes. Defaults to 64.
+        enablePrint (bool, optional): print the progress to stdout. Defaults to True.
+    """
+    random.seed(0)
+    game = BitboardCheckers(size, ttSize)
+    entries: Dict[int, Tuple[int, Positions]] = {}
+    # the lowest ply every board is reached at, so that it's expanded as much as possible
+    reached: Dict[int, int] = {}
+
+    def expand(player: int, ply: int):
+        game.setTurn(player)
+        key = game.hash
+        if key in reached and reached[key] <= ply:
+            return
+        reached[key] = ply
+        moves = game.nextSequences(player)
+        if len(moves) == 0:
+            return
+        if key not in entries:
+            entries[key] = game.searchBestMove(player, moves, maxDepth, evaluate, search=search)
+            if enablePrint and len(entries) % 100 == 0:
+                print(f"{len(entries)} boards")
+        if ply + 1 == plies:
+            return
+        for move, _, _ in moves:
+            removed, promoted = game.playSequence(move)
+            expand(1 - player, ply + 1)
+            game.undoSequence(move, removed, promoted)
+
+    for player in (Checkers.BLACK, Checkers.WHITE):
+        expand(player, 0)
+
+    with open(path, "wb") as f:
+        records = [(key, value, move) for key, (value, move) in entries.items() if len(move) <= MAX_PATH]
+        f.write(HEADER.pack(MAGIC, size, len(records)))
+        for key, value, move in sorted(records):
+            squares = [x * size + y for x, y in move] + [0] * (MAX_PATH - len(move))
+            f.write(RECORD.pack(key, value, len(move), *squares))
+    if enablePrint:
+        print(f"{len(records)} boards are written to {path}")
+
+
+class OpeningBook(object):
+    """
+    opening book made by build, its records are sorted by the hash of their boards,
+    so a board is found by binary search.
+    the book moves are played instead of searching, so they don't depend on the evaluation function,
+    the depth or the search algorithm of the player
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open an opening book file
+
+        Args:
+            path (str): the path of the file
+        Raises:
+            Exception: if it's not an opening book file
+        """
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size, self.count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise Exception("The file isn't a checkers opening book")
+
+    def close(self):
+        """Close the opening book file"""
+        self.data.close()
+        self.file.close()
+
+    def lookup(self, key: int) -> Optional[Tuple[Positions, int]]:
+        """Get the best move of a board
+
+        Args:
+            key (int): the hash of the board (Checkers.hash), with the turn of the player to move
+
+        Returns:
+            path (Positions): the path of the best move.
+            value (int): the score of the best move.
+            or None if the board isn't in the book
+        """
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            record = RECORD.unpack_from(self.data, HEADER.size + mid * RECORD.size)
+            if record[0] < key:
+                low = mid + 1
+            elif record[0] > key:
+                high = mid
+            else:
+                value, length, squares = record[1], record[2], record[3:]
+                return [(s // self.size, s % self.size) for s in squares[:length]], value
+        return None
+
+
+if __name__ == "__main__":
+    # python OpeningBook.py [plies] [max depth] [file]
+    plies = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    maxDepth = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+    path = sys.argv[3] if len(sys.argv) > 3 else "openings.bin"
+    build(path, plies, maxDepth)
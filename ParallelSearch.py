@@ -0,0 +1,253 @@
+import multiprocessing
+from typing import Callable, Tuple
+from Checkers import Checkers, Positions, Sequences, SearchTimeout
+from Tablebase import Tablebase
+
+# the seconds between the checks of the stop flag of the game while the workers search
+POLL_INTERVAL = 0.05
+
+# the shared best score of the root, stop flag and quiescence nodes, and the games of the worker process
+_alpha = None
+_stopped = None
+_quiescenceNodes = None
+_games = {}
+_ttSize = 0
+_tablebase = None
+
+
+class _SharedFlag(object):
+    """
+    the stop flag shared by the processes, it's used as Checkers.stopped which is only checked for its truth
+    """
+
+    def __init__(self, value) -> None:
+        self.value = value
+
+    def __bool__(self) -> bool:
+        return self.value.get_obj().value != 0
+
+
+class _SharedCounter(object):
+    """
+    the number of quiescence nodes shared by the processes, it's used as Checkers.quiescenceNodes
+    which is only compared to the limit and incremented, so the budget is shared by the whole root like the serial search
+    """
+
+    def __init__(self, value) -> None:
+        self.value = value
+
+    def __ge__(self, other: int) -> bool:
+        return self.value.get_obj().value >= other
+
+    def __iadd__(self, other: int):
+        with self.value.get_lock():
+            self.value.value += other
+        return self
+
+
+def _initWorker(alpha, stopped, quiescenceNodes, ttSize: float, tablebase: str):
+    """Initialize a worker process of the pool
+
+    Args:
+        alpha (multiprocessing.Value): the shared best score of the root
+        stopped (multiprocessing.Value): the shared stop flag of the search
+        quiescenceNodes (multiprocessing.Value): the shared number of searched quiescence nodes of the root
+        ttSize (float): the memory of the transposition table of the worker in megabytes
+        tablebase (str): the path of the endgame tablebase or None
+    """
+    global _alpha, _stopped, _quiescenceNodes, _ttSize, _tablebase
+    _alpha = alpha
+    _stopped = _SharedFlag(stopped)
+    _quiescenceNodes = _SharedCounter(quiescenceNodes)
+    _ttSize = ttSize
+    if tablebase is not None:
+        _tablebase = Tablebase(tablebase)
+
+
+def _searchMove(task) -> Tuple[int, int, bool]:
+    """Search a root move in a worker process,
+    the best score found so far by all the workers is used as alpha, so the move can be pruned,
+    it's read again at every node, so the improvements found by the others while searching prune it too.
+    the worker stops with the game (stop flag or deadline)
+
+    Args:
+        task (tuple): game class, size, board, player, index and path of the move,
+            repetition penalty, beta, max depth, evaluation function, search algorithm, deadline,
+            quiescence limit and move ordering of the search
+
+    Returns:
+        index (int): the index of the searched move.
+        value (int): score of the move, None if the deadline is over.
+        exact (bool): false if the move is pruned, then the score is only an upper bound.
+            a score greater than or equal to beta is only a lower bound.
+    """
+    (gameClass, size, board, player, index, path, penalty, beta,
+     maxDepth, evaluate, search, deadline, quiescence, ordering) = task
+    if (gameClass, size) not in _games:
+        _games[(gameClass, size)] = gameClass(size, _ttSize)
+        _games[(gameClass, size)].tablebase = _tablebase
+    game = _games[(gameClass, size)]
+    game.setBoard(board)
+    game.setTurn(player)
+
+    removed, promoted = game.playSequence(path)
+    alpha = _alpha.value - penalty
+    game.deadline = deadline
+    game.stopped = _stopped
+    game.quiescenceLimit = quiescence
+    game.quiescenceNodes = _quiescenceNodes
+    game.sharedAlpha = lambda: _alpha.get_obj().value - penalty
+    if (game.moveOrdering is not None) != ordering:
+        game.useMoveOrdering(ordering)
+    try:
+        value = search(game, 1 - player, player, alpha=alpha, beta=beta, maxDepth=maxDepth, evaluate=evaluate)
+    except SearchTimeout:
+        return index, None, False
+    finally:
+        game.deadline = None
+        game.stopped = False
+        game.quiescenceNodes = 0
+        game.sharedAlpha = None
+        game.undoSequence(path, removed, promoted)
+
+    # alpha only grows, and the last one is the highest alpha used by the search
+    alpha = max(alpha, _alpha.value - penalty)
+    exact = value > alpha
+    value += penalty
+    if exact:
+        with _alpha.get_lock():
+            if value > _alpha.value:
+                _alpha.value = value
+    return index, value, exact
+
+
+class ParallelSearch(object):
+    """
+    searches the root moves of minimaxPlay in a pool of processes,
+    the first move is searched by the game itself and the others are searched in parallel,
+    they share the best score so far as alpha so that the later moves can be pruned,
+    the stop flag and the deadline of the game, and the quiescence nodes of the root.
+    the quiescence budget is consumed in a different order than the serial search,
+    so with quiescence the score can differ from it when the budget runs out.
+    on windows, it must be made inside `if __name__ == "__main__":`
+    """
+
+    def __init__(self, processes: int = None, ttSize: float = 0, tablebase: str = None) -> None:
+        """Start the pool of processes
+
+        Args:
+            processes (int, optional): the number of processes. Defaults to the number of cpus.
+            ttSize (float, optional): the memory of the transposition table of each process in megabytes.
+                Defaults to 0.
+            tablebase (str, optional): the path of the endgame tablebase probed by the processes.
+                Defaults to None.
+        """
+        self.alpha = multiprocessing.Value("q", -Checkers.OO)
+        self.stopped = multiprocessing.Value("b", 0)
+        self.quiescenceNodes = multiprocessing.Value("q", 0)
+        self.pool = multiprocessing.Pool(
+            processes, initializer=_initWorker,
+            initargs=(self.alpha, self.stopped, self.quiescenceNodes, ttSize, tablebase)
+        )
+
+    def close(self):
+        """Stop the pool of processes"""
+        self.pool.terminate()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def searchRoot(
+        self,
+        game: Checkers,
+        player: int,
+        moves: Sequences,
+        maxDepth: int = 4,
+        evaluate: Callable[[int], int] = Checkers.evaluate2,
+        firstMove: Positions = None,
+        alpha: int = -Checkers.OO,
+        beta: int = Checkers.OO,
+        search: Callable[..., int] = Checkers.minimax,
+    ) -> Tuple[int, Positions]:
+        """Search the moves of the player to move, it gives the same best score as Checkers.searchRoot
+
+        Args:
+            game (Checkers): the game to search
+            player (int): the type of the player (WHITE, BLACK)
+            moves (Sequences): the moves of the player
+            maxDepth (int, optional): the max depth of the minimax algorithm. Defaults to 4.
+            evaluate (Callable[[int], int], optional): evaluation function. Defaults to evaluate2
+            firstMove (Positions, optional): the path of the move to search first. Defaults to None.
+            alpha (int, optional): the value of alpha. Defaults to -OO.
+            beta (int, optional): the value of beta. Defaults to OO.
+            search (Callable[..., int], optional): the search algorithm (minimax, pvs). Defaults to minimax.
+
+        Raises:
+            SearchTimeout: if the deadline of the game is over or the game is stopped
+
+        Returns:
+            bestValue (int): score of the best move.
+            bestMove (Positions): the path of the best move.
+        """
+        if firstMove is not None:
+            game.moveToFront(moves, firstMove)
+        order = [path for path, _, _ in moves]
+
+        # the eldest brother is searched first to get a good alpha for the others
+        tasks = []
+        game.quiescenceNodes = 0
+        for i, path in enumerate(order):
+            removed, promoted = game.playSequence(path)
+            try:
+                penalty = 2*game.stateValue(player)
+                if i == 0:
+                    bestValue = search(
+                        game, 1 - player, player, alpha=alpha - penalty, beta=beta - penalty,
+                        maxDepth=maxDepth, evaluate=evaluate
+                    ) + penalty
+            finally:
+                game.undoSequence(path, removed, promoted)
+            if i != 0:
+                tasks.append(
+                    (type(game), game.size, game.board, player, i, path, penalty, beta - penalty, maxDepth,
+                     evaluate, search, game.deadline, game.quiescenceLimit, game.moveOrdering is not None)
+                )
+        bestMove = order[0]
+        if len(tasks) == 0 or bestValue >= beta:
+            return bestValue, bestMove
+
+        self.alpha.value = max(alpha, bestValue)
+        self.stopped.value = 0
+        # the other moves use what is left of the quiescence budget of the root
+        self.quiescenceNodes.value = game.quiescenceNodes
+        results = {}
+        timeout = False
+        it = self.pool.imap_unordered(_searchMove, tasks)
+        for _ in range(len(tasks)):
+            while True:
+                try:
+                    i, value, exact = it.next(POLL_INTERVAL)
+                    break
+                except multiprocessing.TimeoutError:
+                    if game.stopped:
+                        self.stopped.value = 1
+            if value is None:
+                # the other workers stop too, all of them are waited so none is left searching
+                timeout = True
+                self.stopped.value = 1
+            elif exact:
+                results[i] = value
+        game.quiescenceNodes = self.quiescenceNodes.value
+        if timeout:
+            raise SearchTimeout()
+
+        # break the ties by the order of the moves like the serial search
+        for i in range(1, len(order)):
+            if i in results and results[i] > bestValue:
+                bestValue = results[i]
+                bestMove = order[i]
+        return bestValue, bestMove
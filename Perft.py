@@ -0,0 +1,360 @@
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+from Checkers import Checkers, Board, Positions
+from BitboardCheckers import BitboardCheckers
+
+# the size of the board, its rows ("." empty, "w"/"b" men, "W"/"B" kings) or None for the initial board,
+# and the player to move
+PerftPosition = Tuple[int, List[str], int]
+
+PIECES = {".": 0, "w": Checkers.WHITE_MAN, "b": Checkers.BLACK_MAN, "W": Checkers.WHITE_KING, "B": Checkers.BLACK_KING}
+
+POSITIONS: Dict[str, PerftPosition] = {
+    "start4": (4, None, Checkers.BLACK),
+    "start6": (6, None, Checkers.BLACK),
+    "start8": (8, None, Checkers.BLACK),
+    "start10": (10, None, Checkers.BLACK),
+    "start12": (12, None, Checkers.BLACK),
+    # kings and multiple captures
+    "kings8": (8, [
+        ". w . . . w . .",
+        ". . . . w . . .",
+        ". w . . . . . w",
+        "b . b . W . . .",
+        ". . . b . . . .",
+        ". . b . . . B .",
+        ". b . . . b . b",
+        ". . . . b . . .",
+    ], Checkers.WHITE),
+    # branching multiple captures, a man that is crowned in the middle of a capture stops and a king captures
+    "jumps8": (8, [
+        ". . . . . . . .",
+        "w . . . w . w .",
+        ". W . . . . . .",
+        ". . w . w . w .",
+        ". . . . . . . .",
+        ". . w . w . . .",
+        ". . . b . w . .",
+        "b . . . B . . .",
+    ], Checkers.BLACK),
+    # kings and multiple captures on the other board sizes
+    "kings6": (6, [
+        ". w . . . .",
+        "w . . . B .",
+        ". . . w . .",
+        "b . W . . .",
+        ". . . b . w",
+        "b . . . b .",
+    ], Checkers.WHITE),
+    "kings10": (10, [
+        ". . . w . . . . . .",
+        ". . w . . . . . b .",
+        ". w . . . w . . . .",
+        ". . . . b . . . . .",
+        ". . . . . w . . . .",
+        ". . b . b . W . . .",
+        ". w . . . . . . . .",
+        "B . b . b . . . b .",
+        ". . . . . . . . . .",
+        "b . . . . . b . . .",
+    ], Checkers.WHITE),
+    "jumps12": (12, [
+        ". . . . . . . . . . . .",
+        ". . . . . . w . . . . .",
+        ". . . . . w . . . . . .",
+        ". . . . . . . . . . . .",
+        ". . . w . w . . . w . .",
+        ". . . . . . . . . . . .",
+        ". w . w . w . . . w . .",
+        "b . . . . . b . . . . .",
+        ". . . . . . . . . . . .",
+        ". . . . . . . . . . . .",
+        ". . . . . . . . . . . .",
+        ". . . . . . . . . . . .",
+    ], Checkers.BLACK),
+}
+
+# the number of leaves at every depth, every complete move is a single ply.
+# start8 matches the published numbers of american checkers, there are no published numbers
+# for the other boards, they are counted by referencePerft which doesn't share code with Checkers
+# (python Perft.py verify counts them again)
+REFERENCE: Dict[str, List[int]] = {
+    "start4": [3, 9, 12, 16, 22, 26, 40, 59, 105, 194],
+    "start6": [5, 25, 106, 369, 1271, 4104, 12495, 37474],
+    "start8": [7, 49, 302, 1469, 7361, 36768, 179740],
+    "start10": [9, 81, 658, 4265, 26875, 164406],
+    "start12": [11, 121, 1222, 10053, 78629],
+    "kings8": [9, 24, 91, 372, 1965],
+    "jumps8": [4, 35, 82, 677, 1840, 12529, 55483],
+    "kings6": [5, 8, 21, 64, 155, 498, 1342, 4338, 12282, 44037],
+    "kings10": [4, 9, 28, 152, 1429, 14326, 136655],
+    "jumps12": [3, 25, 31, 308, 1034, 9776, 32483],
+}
+
+
+def parseBoard(size: int, rows: List[str] = None) -> Board:
+    """Make a board from its rows
+
+    Args:
+        size (int): size of the checkers board
+        rows (List[str], optional): the squares of every row separated by spaces,
+            "." for empty, "w"/"b" for men and "W"/"B" for kings. Defaults to the initial board.
+
+    Returns:
+        Board: the board
+    """
+    if rows is None:
+        return Checkers.initialBoard(size)
+    return [[PIECES[square] for square in row.split()] for row in rows]
+
+
+def perft(game: Checkers, player: int, depth: int) -> int:
+    """Count the leaves of the game tree, it's used to test and time the move generator
+
+    Args:
+        game (Checkers): the game
+        player (int): the player to move (WHITE, BLACK)
+        depth (int): the depth of the tree
+
+    Returns:
+        int: the number of leaves
+    """
+    if depth == 0:
+        return 1
+    nodes = 0
+    for path, _, _ in game.nextSequences(player):
+        removed, promoted = game.playSequence(path)
+        nodes += perft(game, 1 - player, depth - 1)
+        game.undoSequence(path, removed, promoted)
+    return nodes
+
+
+def referenceMoves(board: Board, player: int) -> List[Tuple[Positions, Board]]:
+    """Get the complete moves of a player and the board after every one of them.
+    it's written apart from Checkers (it copies the board at every step instead of playing and undoing moves,
+    and it doesn't use the tables or the piece sets of the game), so its counts check the move generator
+    with the same rules: captures are mandatory, a capture continues while the piece can capture,
+    the captured pieces are removed at once, men move and capture forward and a crowned man stops
+
+    Args:
+        board (Board): the board
+        player (int): the player to move (WHITE, BLACK)
+
+    Returns:
+        List[Tuple[Positions, Board]]: the path of every move and the board after it
+    """
+    size = len(board)
+
+    def directions(piece: int) -> List[Tuple[int, int]]:
+        if piece in (Checkers.WHITE_KING, Checkers.BLACK_KING):
+            return [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+        forward = 1 if piece == Checkers.WHITE_MAN else -1
+        return [(forward, 1), (forward, -1)]
+
+    def crown(piece: int, x: int) -> int:
+        if piece == Checkers.WHITE_MAN and x == size - 1:
+            return Checkers.WHITE_KING
+        if piece == Checkers.BLACK_MAN and x == 0:
+            return Checkers.BLACK_KING
+        return piece
+
+    def inside(x: int, y: int) -> bool:
+        return 0 <= x < size and 0 <= y < size
+
+    def addJumps(board: Board, path: Positions, moves: List[Tuple[Positions, Board]]):
+        x, y = path[-1]
+        piece = board[x][y]
+        jumped = False
+        for dx, dy in directions(piece):
+            mx, my, nx, ny = x + dx, y + dy, x + 2 * dx, y + 2 * dy
+            if not inside(nx, ny) or board[nx][ny] != 0 or board[mx][my] == 0 or board[mx][my] % 2 == player:
+                continue
+            jumped = True
+            after = [row[:] for row in board]
+            after[x][y] = after[mx][my] = 0
+            after[nx][ny] = crown(piece, nx)
+            if after[nx][ny] != piece:
+                moves.append((path + [(nx, ny)], after))
+            else:
+                addJumps(after, path + [(nx, ny)], moves)
+        if not jumped and len(path) > 1:
+            moves.append((path, board))
+
+    squares = [(x, y) for x in range(size) for y in range(size) if board[x][y] != 0 and board[x][y] % 2 == player]
+    moves = []
+    for x, y in squares:
+        addJumps(board, [(x, y)], moves)
+    if len(moves) != 0:
+        return moves
+    for x, y in squares:
+        for dx, dy in directions(board[x][y]):
+            nx, ny = x + dx, y + dy
+            if inside(nx, ny) and board[nx][ny] == 0:
+                after = [row[:] for row in board]
+                after[x][y] = 0
+                after[nx][ny] = crown(board[x][y], nx)
+                moves.append(([(x, y), (nx, ny)], after))
+    return moves
+
+
+def referencePerft(board: Board, player: int, depth: int) -> int:
+    """Count the leaves of the game tree with referenceMoves
+
+    Args:
+        board (Board): the board
+        player (int): the player to move (WHITE, BLACK)
+        depth (int): the depth of the tree
+
+    Returns:
+        int: the number of leaves
+    """
+    if depth == 0:
+        return 1
+    return sum(referencePerft(after, 1 - player, depth - 1) for _, after in referenceMoves(board, player))
+
+
+def runPerft(gameClass: type = BitboardCheckers, maxDepth: int = None, enablePrint: bool = True) -> bool:
+    """Count the leaves of every position at every depth and compare them to the reference counts
+
+    Args:
+        gameClass (type, optional): the class of the game (Checkers, BitboardCheckers).
+            Defaults to BitboardCheckers.
+        maxDepth (int, optional): the max depth of the trees. Defaults to the depth of the reference counts.
+        enablePrint (bool, optional): print the counts and the nodes per second to stdout. Defaults to True.
+
+    Returns:
+        bool: true if all the counts match
+    """
+    passed = True
+    for name, (size, rows, player) in POSITIONS.items():
+        game = gameClass(size)
+        game.setBoard(parseBoard(size, rows))
+        reference = REFERENCE[name]
+        for depth in range(1, min(len(reference), maxDepth or len(reference)) + 1):
+            start = time.perf_counter()
+            nodes = perft(game, player, depth)
+            elapsed = time.perf_counter() - start
+            ok = nodes == reference[depth - 1]
+            passed = passed and ok
+            if enablePrint:
+                print(
+                    f"{name} depth {depth}: {nodes} nodes {'ok' if ok else f'expected {reference[depth - 1]}'} "
+                    f"({elapsed:.3f}s, {nodes / max(elapsed, 1e-9):.0f} nodes/s)"
+                )
+    return passed
+
+
+def verifyReference(maxDepth: int = None, enablePrint: bool = True) -> bool:
+    """Count the leaves of every position at every depth with referencePerft and compare them to the reference counts
+
+    Args:
+        maxDepth (int, optional): the max depth of the trees. Defaults to the depth of the reference counts.
+        enablePrint (bool, optional): print the counts to stdout. Defaults to True.
+
+    Returns:
+        bool: true if all the counts match
+    """
+    passed = True
+    for name, (size, rows, player) in POSITIONS.items():
+        board = parseBoard(size, rows)
+        reference = REFERENCE[name]
+        for depth in range(1, min(len(reference), maxDepth or len(reference)) + 1):
+            nodes = referencePerft(board, player, depth)
+            ok = nodes == reference[depth - 1]
+            passed = passed and ok
+            if enablePrint:
+                print(f"{name} depth {depth}: {nodes} nodes {'ok' if ok else f'expected {reference[depth - 1]}'}")
+    return passed
+
+
+def benchmarkPositions(size: int = 8, count: int = 10, plies: int = 10, seed: int = 0) -> List[Tuple[Board, int]]:
+    """Make a fixed set of positions by playing random moves from the initial board
+
+    Args:
+        size (int, optional): size of the checkers board. Defaults to 8.
+        count (int, optional): the number of positions. Defaults to 10.
+        plies (int, optional): the number of random moves of every position. Defaults to 10.
+        seed (int, optional): the seed of the random moves. Defaults to 0.
+
+    Returns:
+        List[Tuple[Board, int]]: the boards and their players to move
+    """
+    rand = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        game = Checkers(size)
+        player = Checkers.BLACK
+        for _ in range(plies):
+            moves = game.nextSequences(player)
+            if len(moves) == 0:
+                break
+            game.playSequence(rand.choice(moves)[0])
+            player = 1 - player
+        else:
+            if len(game.nextSequences(player)) != 0:
+                positions.append((game.getBoard(), player))
+    return positions
+
+
+def benchmark(
+    gameClass: type = BitboardCheckers,
+    evaluators: Dict[str, Callable[[int], int]] = None,
+    maxDepth: int = 6,
+    positions: List[Tuple[Board, int]] = None,
+    enablePrint: bool = True,
+) -> Dict[str, Tuple[float, int]]:
+    """Time minimax on a fixed set of positions with every evaluation function
+
+    Args:
+        gameClass (type, optional): the class of the game (Checkers, BitboardCheckers).
+            Defaults to BitboardCheckers.
+        evaluators (Dict[str, Callable[[int], int]], optional): the evaluation functions by their names.
+            Defaults to evaluate1, evaluate2 and endGame.
+        maxDepth (int, optional): the max depth of minimax. Defaults to 6.
+        positions (List[Tuple[Board, int]], optional): the positions. Defaults to benchmarkPositions().
+        enablePrint (bool, optional): print the results to stdout. Defaults to True.
+
+    Returns:
+        Dict[str, Tuple[float, int]]: the time of every evaluation function and the sum of its scores,
+            the sum must not change when the search is only made faster
+    """
+    if evaluators is None:
+        evaluators = {"evaluate1": Checkers.evaluate1, "evaluate2": Checkers.evaluate2, "endGame": Checkers.endGame}
+    if positions is None:
+        positions = benchmarkPositions()
+    results = {}
+    for name, evaluate in evaluators.items():
+        total = 0
+        elapsed = 0
+        for board, player in positions:
+            game = gameClass(len(board))
+            game.setBoard(board)
+            start = time.perf_counter()
+            total += game.minimax(player, player, maxDepth=maxDepth, evaluate=evaluate)
+            elapsed += time.perf_counter() - start
+        results[name] = (elapsed, total)
+        if enablePrint:
+            print(f"{name}: {elapsed:.3f}s for {len(positions)} positions at depth {maxDepth} (scores sum {total})")
+    return results
+
+
+if __name__ == "__main__":
+    # python Perft.py [perft|verify|benchmark] [depth]
+    command = sys.argv[1] if len(sys.argv) > 1 else "perft"
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    if command == "perft":
+        for gameClass in (Checkers, BitboardCheckers):
+            print(gameClass.__name__)
+            if not runPerft(gameClass, depth):
+                sys.exit(1)
+    elif command == "verify":
+        if not verifyReference(depth):
+            sys.exit(1)
+    elif command == "benchmark":
+        for gameClass in (Checkers, BitboardCheckers):
+            print(gameClass.__name__)
+            benchmark(gameClass, maxDepth=depth or 6)
+    else:
+        raise Exception(f"Unknown command {command}")
@@ -0,0 +1,137 @@
+import math
+import time
+from typing import Callable, List
+
+
+class SearchStats(object):
+    """
+    statistics of the searches of a game, it's enabled by setting Checkers.stats,
+    and it's kept between the plays of the game until it's cleared
+    """
+
+    def __init__(self) -> None:
+        """Make empty statistics"""
+        self.clear()
+
+    def clear(self):
+        """Remove all the statistics"""
+        # nodes[d] is the number of searched nodes at depth d (0 is the children of the root)
+        self.nodes: List[int] = []
+        # cutoffs[i] is the number of beta cutoffs made by the i-th move of a node
+        self.cutoffs: List[int] = []
+        self.evaluations = 0
+        self.evaluationTime = 0.0
+        self.ttProbes = 0
+        self.ttHits = 0
+        # the wall time of every played move
+        self.moveTimes: List[float] = []
+        # the searched nodes of the played moves, without the nodes of a search that isn't over
+        self.moveNodes = 0
+
+    def node(self, depth: int):
+        """Count a searched node
+
+        Args:
+            depth (int): the depth of the node
+        """
+        while len(self.nodes) <= depth:
+            self.nodes.append(0)
+        self.nodes[depth] += 1
+
+    def cutoff(self, index: int):
+        """Count a beta cutoff
+
+        Args:
+            index (int): the index of the move that caused the cutoff in the ordered moves
+        """
+        while len(self.cutoffs) <= index:
+            self.cutoffs.append(0)
+        self.cutoffs[index] += 1
+
+    def addMove(self, seconds: float):
+        """Count a played move, all the searched nodes so far are nodes of the played moves
+
+        Args:
+            seconds (float): the wall time of the move
+        """
+        self.moveTimes.append(seconds)
+        self.moveNodes = self.totalNodes()
+
+    def evaluate(self, evaluate: Callable[[int], int], game, maximizer: int) -> int:
+        """Call an evaluation function and count its call and time
+
+        Args:
+            evaluate (Callable[[int], int]): evaluation function
+            game (Checkers): the game to evaluate
+            maximizer (int): the type of the maximizer player (WHITE, BLACK)
+
+        Returns:
+            int: the score of the evaluation function
+        """
+        start = time.perf_counter()
+        score = evaluate(game, maximizer)
+        self.evaluationTime += time.perf_counter() - start
+        self.evaluations += 1
+        return score
+
+    def merge(self, other: "SearchStats"):
+        """Add the statistics of another search to these statistics
+
+        Args:
+            other (SearchStats): the other statistics
+        """
+        for depth, count in enumerate(other.nodes):
+            while len(self.nodes) <= depth:
+                self.nodes.append(0)
+            self.nodes[depth] += count
+        for index, count in enumerate(other.cutoffs):
+            while len(self.cutoffs) <= index:
+                self.cutoffs.append(0)
+            self.cutoffs[index] += count
+        self.evaluations += other.evaluations
+        self.evaluationTime += other.evaluationTime
+        self.ttProbes += other.ttProbes
+        self.ttHits += other.ttHits
+        self.moveTimes += other.moveTimes
+        self.moveNodes += other.moveNodes
+
+    def totalNodes(self) -> int:
+        """Get the number of searched nodes"""
+        return sum(self.nodes)
+
+    def branchingFactor(self) -> float:
+        """Get the effective branching factor, the average growth of the nodes from a depth to the next one,
+        it's measured up to the depth with the most nodes, so the few deep nodes of the quiescence search
+        don't hide it
+
+        Returns:
+            float: the effective branching factor, 0 if there are less than two depths
+        """
+        if len(self.nodes) < 2 or self.nodes[0] == 0:
+            return 0.0
+        peak = self.nodes.index(max(self.nodes))
+        if peak == 0:
+            return 0.0
+        return math.pow(self.nodes[peak] / self.nodes[0], 1 / peak)
+
+    def summary(self) -> str:
+        """Get the statistics as text
+
+        Returns:
+            str: the summary of the statistics
+        """
+        moves = len(self.moveTimes)
+        totalTime = sum(self.moveTimes)
+        cutoffs = sum(self.cutoffs)
+        # the speed of the played moves only, the time of a search that isn't over isn't known
+        speed = f"{self.moveNodes / totalTime:.0f} nodes/s" if totalTime > 0 else "n/a nodes/s"
+        lines = [
+            f"moves: {moves} ({totalTime:.3f}s, {totalTime / max(moves, 1):.3f}s per move)",
+            f"nodes: {self.totalNodes()} ({speed}), per depth {self.nodes}",
+            f"effective branching factor: {self.branchingFactor():.2f}",
+            f"cutoffs: {cutoffs}, "
+            f"{100 * (self.cutoffs[0] if cutoffs else 0) / max(cutoffs, 1):.1f}% by the first move, per move index {self.cutoffs}",
+            f"evaluations: {self.evaluations} ({self.evaluationTime:.3f}s)",
+            f"transposition table: {self.ttHits}/{self.ttProbes} hits ({100 * self.ttHits / max(self.ttProbes, 1):.1f}%)",
+        ]
+        return "\n".join(lines)
@@ -0,0 +1,255 @@
+import mmap
+import multiprocessing
+import os
+import random
+import struct
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+from Checkers import Checkers, Board, Positions
+from BitboardCheckers import BitboardCheckers
+from Tournament import PlayerConfig
+
+MAGIC = b"CKSP"
+# the magic, the size of the board and the number of records of a chunk file
+HEADER = struct.Struct("<4sBI")
+# the record of a position follows its packed board:
+# the player to move, if the position is searched, the search score and the result for the player to move
+RECORD = struct.Struct("<BBib")
+
+# the dark squares of every board size
+SQUARES: Dict[int, Positions] = {}
+
+
+def darkSquares(size: int) -> Positions:
+    """Get the squares that can hold a piece, row by row
+
+    Args:
+        size (int): size of the checkers board
+
+    Returns:
+        Positions: the dark squares
+    """
+    if size not in SQUARES:
+        SQUARES[size] = [(x, y) for x in range(size) for y in range(size) if (x + y) % 2 == 1]
+    return SQUARES[size]
+
+
+def packedSize(size: int) -> int:
+    """Get the number of bytes of a packed board, every dark square takes 4 bits
+
+    Args:
+        size (int): size of the checkers board
+
+    Returns:
+        int: the number of bytes
+    """
+    return (size * size // 2 + 1) // 2
+
+
+def packBoard(board: Board) -> bytes:
+    """Pack the dark squares of a board, two squares in a byte (the first one in the low 4 bits)
+
+    Args:
+        board (Board): the board
+
+    Returns:
+        bytes: the packed board
+    """
+    squares = darkSquares(len(board))
+    data = bytearray(packedSize(len(board)))
+    for k, (x, y) in enumerate(squares):
+        data[k >> 1] |= board[x][y] << (4 * (k & 1))
+    return bytes(data)
+
+
+def unpackBoard(data: bytes, size: int) -> Board:
+    """Unpack a board packed by packBoard
+
+    Args:
+        data (bytes): the packed board
+        size (int): size of the checkers board
+
+    Returns:
+        Board: the board
+    """
+    board = [[0] * size for _ in range(size)]
+    for k, (x, y) in enumerate(darkSquares(size)):
+        board[x][y] = (data[k >> 1] >> (4 * (k & 1))) & 15
+    return board
+
+
+def playGame(task) -> Tuple[int, List[bytes]]:
+    """Play a single self-play game and record all its positions
+
+    Args:
+        task (tuple): index of the game, seed, first player, second player, game class,
+            size of the board, memory of the transposition table, max moves without capture
+            and the number of random moves at the start of the game
+
+    Returns:
+        index (int): the index of the game.
+        records (List[bytes]): the record of every position of the game, packed board followed by RECORD.
+    """
+    index, seed, first, second, gameClass, size, ttSize, maxMoves, randomPlies = task
+    random.seed(seed)
+    game = gameClass(size, ttSize)
+    randomPlayer = PlayerConfig(randomPlay=True)
+    player = Checkers.BLACK if seed % 2 == 0 else Checkers.WHITE
+    startPlayer = player
+    positions = []
+    cnt = 0
+    plies = 0
+    while cnt < maxMoves:
+        config = first if player == startPlayer else second
+        if plies < randomPlies:
+            config = randomPlayer
+        board = packBoard(game.board)
+        cont, reset = config.play(game, player, cnt)
+        if not cont:
+            break
+        positions.append((board, player, game.lastValue))
+        player = 1 - player
+        cnt += 1
+        plies += 1
+        if reset:
+            cnt = 0
+
+    # the player that can't move loses
+    winner = None if cnt == maxMoves else 1 - player
+    records = []
+    for board, mover, value in positions:
+        result = 0 if winner is None else (1 if mover == winner else -1)
+        records.append(board + RECORD.pack(mover, value is not None, value or 0, result))
+    return index, records
+
+
+def writeChunk(path: str, size: int, records: List[bytes]):
+    """Write the records of a chunk file, the file appears complete or not at all
+
+    Args:
+        path (str): the path of the chunk file
+        size (int): size of the checkers board
+        records (List[bytes]): the records
+    """
+    with open(path + ".tmp", "wb") as f:
+        f.write(HEADER.pack(MAGIC, size, len(records)))
+        f.write(b"".join(records))
+    os.replace(path + ".tmp", path)
+
+
+def generate(
+    directory: str,
+    games: int = 1000,
+    first: PlayerConfig = None,
+    second: PlayerConfig = None,
+    seed: int = 0,
+    processes: int = None,
+    size: int = 8,
+    gameClass: type = BitboardCheckers,
+    ttSize: float = 0,
+    maxMoves: int = 100,
+    randomPlies: int = 4,
+    chunkSize: int = 1 << 20,
+    enablePrint: bool = True,
+) -> int:
+    """Play self-play games in a pool of processes and stream their positions to chunk files,
+    only one chunk is kept in memory at a time
+
+    Args:
+        directory (str): the directory of the chunk files, it's made if it doesn't exist
+        games (int, optional): the number of games. Defaults to 1000.
+        first (PlayerConfig, optional): the player that starts the games. Defaults to PlayerConfig().
+        second (PlayerConfig, optional): the other player. Defaults to the first player.
+        seed (int, optional): the seed of the first game, the game i uses seed + i. Defaults to 0.
+        processes (int, optional): the number of processes. Defaults to the number of cpus.
+        size (int, optional): size of the checkers board. Defaults to 8.
+        gameClass (type, optional): the class of the game (Checkers, BitboardCheckers).
+            Defaults to BitboardCheckers.
+        ttSize (float, optional): the memory of the transposition table of each game in megabytes.
+            Defaults to 0.
+        maxMoves (int, optional): the number of moves without capture to draw. Defaults to 100.
+        randomPlies (int, optional): the number of random moves at the start of every game,
+            so that the games are different. Defaults to 4.
+        chunkSize (int, optional): the number of positions of every chunk file. Defaults to 2^20.
+        enablePrint (bool, optional): print the progress to stdout. Defaults to True.
+
+    Returns:
+        int: the number of written positions
+    """
+    if first is None:
+        first = PlayerConfig()
+    if second is None:
+        second = first
+    os.makedirs(directory, exist_ok=True)
+    tasks = (
+        (i, seed + i, first, second, gameClass, size, ttSize, maxMoves, randomPlies)
+        for i in range(games)
+    )
+    chunk = []
+    chunks = 0
+    total = 0
+    with multiprocessing.Pool(processes) as pool:
+        for played, (_, records) in enumerate(pool.imap_unordered(playGame, tasks), 1):
+            chunk += records
+            while len(chunk) >= chunkSize:
+                writeChunk(os.path.join(directory, f"chunk-{seed}-{chunks:05d}.bin"), size, chunk[:chunkSize])
+                del chunk[:chunkSize]
+                chunks += 1
+            total += len(records)
+            if enablePrint:
+                print(f"{played}/{games} games, {total} positions", end="\r")
+    if len(chunk) != 0:
+        writeChunk(os.path.join(directory, f"chunk-{seed}-{chunks:05d}.bin"), size, chunk)
+    if enablePrint:
+        print(f"\n{total} positions are written to {directory}")
+    return total
+
+
+def chunkFiles(directory: str) -> List[str]:
+    """Get the complete chunk files of a directory
+
+    Args:
+        directory (str): the directory of the chunk files
+
+    Returns:
+        List[str]: the paths of the chunk files
+    """
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.startswith("chunk-") and name.endswith(".bin")
+    )
+
+
+def readChunk(path: str) -> Iterator[Tuple[Board, int, Optional[int], int]]:
+    """Read the positions of a chunk file
+
+    Args:
+        path (str): the path of the chunk file
+
+    Raises:
+        Exception: if it's not a self-play chunk file
+
+    Yields:
+        board (Board): the board.
+        player (int): the player to move (WHITE, BLACK).
+        score (int): the search score for the player to move, None if the move was random.
+        result (int): 1 if the player to move won the game, -1 if it lost and 0 for a draw.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        magic, size, count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise Exception("The file isn't a checkers self-play chunk")
+        boardSize = packedSize(size)
+        recordSize = boardSize + RECORD.size
+        for i in range(count):
+            offset = HEADER.size + i * recordSize
+            player, scored, score, result = RECORD.unpack_from(data, offset + boardSize)
+            yield unpackBoard(data[offset:offset + boardSize], size), player, score if scored else None, result
+
+
+if __name__ == "__main__":
+    # python SelfPlay.py [games] [max depth] [directory]
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    maxDepth = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    directory = sys.argv[3] if len(sys.argv) > 3 else "selfplay"
+    generate(directory, games, PlayerConfig(maxDepth=maxDepth, ordering=True), ttSize=16)
@@ -0,0 +1,364 @@
+import mmap
+import struct
+import sys
+from collections import defaultdict
+from itertools import combinations
+from math import comb
+from typing import Dict, List, Optional, Tuple
+from Checkers import Checkers
+
+# number of white men, white kings, black men and black kings
+Signature = Tuple[int, int, int, int]
+
+MAGIC = b"CKTB"
+HEADER = struct.Struct("<4sBBH")
+ENTRY = struct.Struct("<BBBBQQ")
+
+DRAW = 0
+WIN = 1
+LOSS = -1
+
+
+def encode(result: int, distance: int) -> int:
+    """Encode the result of a position in a single byte,
+    0 for a draw, odd numbers for wins and even numbers for losses
+
+    Args:
+        result (int): the result for the player to move (WIN, LOSS, DRAW)
+        distance (int): the number of moves to the end of the game
+
+    Returns:
+        int: the encoded result
+    """
+    if result == WIN:
+        return 2 * min(distance, 128) - 1
+    if result == LOSS:
+        return 2 * min(distance, 126) + 2
+    return 0
+
+
+def decode(value: int) -> Tuple[int, int]:
+    """Decode the result of a position
+
+    Args:
+        value (int): the encoded result
+
+    Returns:
+        result (int): the result for the player to move (WIN, LOSS, DRAW).
+        distance (int): the number of moves to the end of the game.
+    """
+    if value == 0:
+        return DRAW, 0
+    if value % 2 == 1:
+        return WIN, (value + 1) // 2
+    return LOSS, (value - 2) // 2
+
+
+DECODED = [decode(value) for value in range(256)]
+
+
+def signatures(maxPieces: int) -> List[Signature]:
+    """Get all the signatures of the boards with at most the given number of pieces,
+    in the order they must be solved: less pieces first, then less men
+    (a man can only be promoted, so it leads to a signature with less men)
+
+    Args:
+        maxPieces (int): the max number of pieces
+
+    Returns:
+        List[Signature]: the signatures
+    """
+    result = []
+    for wm in range(maxPieces + 1):
+        for wk in range(maxPieces + 1):
+            for bm in range(maxPieces + 1):
+                for bk in range(maxPieces + 1):
+                    if wm + wk >= 1 and bm + bk >= 1 and wm + wk + bm + bk <= maxPieces:
+                        result.append((wm, wk, bm, bk))
+    result.sort(key=lambda sig: (sum(sig), sig[0] + sig[2]))
+    return result
+
+
+def tableSize(size: int, sig: Signature) -> int:
+    """Get the number of entries of a signature's table (some of them are impossible boards)
+
+    Args:
+        size (int): size of the checkers board
+        sig (Signature): the signature
+
+    Returns:
+        int: the number of entries
+    """
+    squares = size * size // 2
+    return comb(squares, sig[0]) * comb(squares, sig[1]) * comb(squares, sig[2]) * comb(squares, sig[3]) * 2
+
+
+def rank(squares: List[int]) -> int:
+    """Get the index of a set of squares in the combinatorial number system
+
+    Args:
+        squares (List[int]): the sorted indices of the squares
+
+    Returns:
+        int: the index of the set
+    """
+    value = 0
+    for i in range(len(squares)):
+        value += comb(squares[i], i + 1)
+    return value
+
+
+def index(size: int, sig: Signature, groups: List[List[int]], player: int) -> int:
+    """Get the index of a board in its signature's table
+
+    Args:
+        size (int): size of the checkers board
+        sig (Signature): the signature of the board
+        groups (List[List[int]]): the sorted squares of white men, white kings, black men and black kings
+        player (int): the player to move (WHITE, BLACK)
+
+    Returns:
+        int: the index of the board
+    """
+    squares = size * size // 2
+    value = 0
+    for k in range(4):
+        value = value * comb(squares, sig[k]) + rank(groups[k])
+    return value * 2 + player
+
+
+def boardGroups(game: Checkers) -> Tuple[Signature, List[List[int]]]:
+    """Get the signature and the sorted squares of every type of piece of a game
+
+    Args:
+        game (Checkers): the game
+
+    Returns:
+        sig (Signature): the signature of the board.
+        groups (List[List[int]]): the sorted squares of white men, white kings, black men and black kings.
+    """
+    c = game.counts
+    sig = (c[Checkers.WHITE_MAN], c[Checkers.WHITE_KING], c[Checkers.BLACK_MAN], c[Checkers.BLACK_KING])
+    # the position of each type of piece in the groups
+    group = [0, 0, 2, 1, 3]
+    groups = [[], [], [], []]
+    half = game.size // 2
+    board = game.board
+    for player in (Checkers.BLACK, Checkers.WHITE):
+        for x, y in game.pieces[player]:
+            groups[group[board[x][y]]].append(x * half + y // 2)
+    for squares in groups:
+        squares.sort()
+    return sig, groups
+
+
+def solve(
+    game: Checkers, sig: Signature, solved: Dict[Signature, bytearray], enablePrint: bool = True
+) -> bytearray:
+    """Solve all the boards of a signature by retrograde analysis,
+    the boards that it can reach with captures and promotions must be already solved
+
+    Args:
+        game (Checkers): a game with the board size of the tables
+        sig (Signature): the signature to solve
+        solved (Dict[Signature, bytearray]): the tables of the solved signatures
+        enablePrint (bool, optional): print the progress to stdout. Defaults to True.
+
+    Returns:
+        bytearray: the encoded result of every board of the signature
+    """
+    size = game.size
+    half = size // 2
+    squares = size * size // 2
+    dark = [(s // half, 2 * (s % half) + 1 - (s // half) % 2) for s in range(squares)]
+    pieces = [Checkers.WHITE_MAN, Checkers.WHITE_KING, Checkers.BLACK_MAN, Checkers.BLACK_KING]
+
+    table = bytearray(tableSize(size, sig))
+    predecessors = defaultdict(list)
+    remaining = {}
+    maxWin = {}
+    # buckets[d] has the boards that may be decided with distance d
+    buckets = defaultdict(list)
+
+    def placements(k, groups):
+        if k == 4:
+            yield groups
+            return
+        used = set(s for g in groups for s in g)
+        for squares_ in combinations(range(squares), sig[k]):
+            if used.intersection(squares_):
+                continue
+            # men can't stay at the last row
+            if k == 0 and any(dark[s][0] == size - 1 for s in squares_):
+                continue
+            if k == 2 and any(dark[s][0] == 0 for s in squares_):
+                continue
+            yield from placements(k + 1, groups + [list(squares_)])
+
+    count = 0
+    for groups in placements(0, []):
+        board = [[0] * size for _ in range(size)]
+        for k in range(4):
+            for s in groups[k]:
+                board[dark[s][0]][dark[s][1]] = pieces[k]
+        game.setBoard(board)
+        for player in (Checkers.BLACK, Checkers.WHITE):
+            count += 1
+            position = index(size, sig, groups, player)
+            game.setTurn(player)
+            moves = game.nextSequences(player)
+            if len(moves) == 0:
+                buckets[0].append((position, LOSS))
+                continue
+            remaining[position] = len(moves)
+            maxWin[position] = 0
+            for path, _, _ in moves:
+                removed, promoted = game.playSequence(path)
+                if len(game.pieces[1 - player]) == 0:
+                    result, distance = LOSS, 0
+                else:
+                    nextSig, nextGroups = boardGroups(game)
+                    nextPosition = index(size, nextSig, nextGroups, 1 - player)
+                    if nextSig == sig:
+                        predecessors[nextPosition].append(position)
+                        result = None
+                    else:
+                        result, distance = DECODED[solved[nextSig][nextPosition]]
+                game.undoSequence(path, removed, promoted)
+
+                if result == LOSS:
+                    buckets[distance + 1].append((position, WIN))
+                elif result == WIN:
+                    remaining[position] -= 1
+                    maxWin[position] = max(maxWin[position], distance)
+            if remaining[position] == 0:
+                buckets[maxWin[position] + 1].append((position, LOSS))
+
+    # decide the boards in the order of their distances, so that wins are as fast as possible
+    # and losses are as slow as possible
+    decided = set()
+    distance = 0
+    while len(buckets) != 0:
+        for position, result in buckets.pop(distance, []):
+            if position in decided:
+                continue
+            decided.add(position)
+            table[position] = encode(result, distance)
+            for previous in predecessors[position]:
+                if previous in decided:
+                    continue
+                if result == LOSS:
+                    buckets[distance + 1].append((previous, WIN))
+                else:
+                    remaining[previous] -= 1
+                    maxWin[previous] = max(maxWin[previous], distance)
+                    if remaining[previous] == 0:
+                        buckets[maxWin[previous] + 1].append((previous, LOSS))
+        distance += 1
+
+    if enablePrint:
+        print(f"{sig}: {count} boards, {len(decided)} decided")
+    return table
+
+
+def generate(path: str, maxPieces: int = 3, size: int = 8, enablePrint: bool = True):
+    """Solve all the boards with at most maxPieces pieces and write them to a file
+
+    Args:
+        path (str): the path of the file
+        maxPieces (int, optional): the max number of pieces. Defaults to 3.
+        size (int, optional): size of the checkers board. Defaults to 8.
+        enablePrint (bool, optional): print the progress to stdout. Defaults to True.
+    """
+    # solve sets a new board for every placement and reads the pieces after every move,
+    # which BitboardCheckers only makes from its masks, so the list board is faster here
+    game = Checkers(size)
+    solved = {}
+    for sig in signatures(maxPieces):
+        solved[sig] = solve(game, sig, solved, enablePrint)
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, size, maxPieces, len(solved)))
+        offset = HEADER.size + ENTRY.size * len(solved)
+        for sig, table in solved.items():
+            f.write(ENTRY.pack(*sig, offset, len(table)))
+            offset += len(table)
+        for table in solved.values():
+            f.write(table)
+
+
+class Tablebase(object):
+    """
+    endgame tablebase made by generate, it's memory mapped
+    so only the probed parts of the file are loaded
+    """
+
+    # score of a won board, it's greater than the score of any evaluation function
+    WIN_SCORE = 10 ** 7
+
+    def __init__(self, path: str) -> None:
+        """Open a tablebase file
+
+        Args:
+            path (str): the path of the file
+        Raises:
+            Exception: if it's not a tablebase file
+        """
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size, self.maxPieces, count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise Exception("The file isn't a checkers tablebase")
+        self.tables = {}
+        for i in range(count):
+            wm, wk, bm, bk, offset, length = ENTRY.unpack_from(self.data, HEADER.size + i * ENTRY.size)
+            self.tables[(wm, wk, bm, bk)] = offset
+
+    def close(self):
+        """Close the tablebase file"""
+        self.data.close()
+        self.file.close()
+
+    def probe(self, game: Checkers, player: int) -> Optional[Tuple[int, int]]:
+        """Get the result of the current board of a game
+
+        Args:
+            game (Checkers): the game
+            player (int): the player to move (WHITE, BLACK)
+
+        Returns:
+            result (int): the result for the player to move (WIN, LOSS, DRAW).
+            distance (int): the number of moves to the end of the game.
+            or None if the board isn't in the tablebase
+        """
+        if game.size != self.size:
+            return None
+        sig, groups = boardGroups(game)
+        if sig not in self.tables:
+            return None
+        return DECODED[self.data[self.tables[sig] + index(self.size, sig, groups, player)]]
+
+    def score(self, game: Checkers, player: int, depth: int) -> Optional[int]:
+        """Get the score of the current board of a game for the player to move,
+        the faster the win (or the slower the loss), the higher the score
+
+        Args:
+            game (Checkers): the game
+            player (int): the player to move (WHITE, BLACK)
+            depth (int): the depth of the board in the search
+
+        Returns:
+            int: score of the board, or None if the board isn't in the tablebase
+        """
+        probed = self.probe(game, player)
+        if probed is None:
+            return None
+        result, distance = probed
+        return result * (self.WIN_SCORE - depth - distance)
+
+
+if __name__ == "__main__":
+    # python Tablebase.py [max pieces] [file]
+    maxPieces = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    path = sys.argv[2] if len(sys.argv) > 2 else f"tablebase{maxPieces}.bin"
+    generate(path, maxPieces)
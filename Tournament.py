@@ -0,0 +1,253 @@
+import math
+import multiprocessing
+import random
+from typing import Callable, Iterator, Tuple
+from Checkers import Checkers
+from BitboardCheckers import BitboardCheckers
+from Tablebase import Tablebase
+from OpeningBook import OpeningBook
+from SearchStats import SearchStats
+
+
+class PlayerConfig(object):
+    """
+    configuration of a computer player in a tournament
+    """
+
+    def __init__(
+        self,
+        evaluate: Callable[[int], int] = Checkers.evaluate2,
+        maxDepth: int = 4,
+        timeLimit: float = None,
+        endGame: Callable[[int], int] = Checkers.endGame,
+        endGameAfter: int = 25,
+        randomPlay: bool = False,
+        quiescence: int = 0,
+        ordering: bool = False,
+        search: Callable[..., int] = Checkers.minimax,
+        aspiration: int = 0,
+        openingBook: bool = True,
+    ) -> None:
+        """Make a player configuration
+
+        Args:
+            evaluate (Callable[[int], int], optional): evaluation function. Defaults to evaluate2.
+            maxDepth (int, optional): the max depth of the minimax algorithm. Defaults to 4.
+            timeLimit (float, optional): the time budget of each move in seconds
+                (iterative deepening instead of max depth). Defaults to None.
+            endGame (Callable[[int], int], optional): evaluation function used at the end of the game.
+                Defaults to endGame.
+            endGameAfter (int, optional): the number of moves without capture
+                after which endGame is used. Defaults to 25.
+            randomPlay (bool, optional): if true the player plays random moves. Defaults to False.
+            quiescence (int, optional): the node limit of the quiescence search, 0 disables it. Defaults to 0.
+            ordering (bool, optional): order the moves by killer moves and history heuristic. Defaults to False.
+            search (Callable[..., int], optional): the search algorithm (minimax, pvs). Defaults to minimax.
+            aspiration (int, optional): the half width of the aspiration windows, 0 disables them. Defaults to 0.
+            openingBook (bool, optional): play the moves of the opening book of the tournament, they are played
+                whatever the evaluation function and the search of the player are. Defaults to True.
+        """
+        self.evaluate = evaluate
+        self.maxDepth = maxDepth
+        self.timeLimit = timeLimit
+        self.endGame = endGame
+        self.endGameAfter = endGameAfter
+        self.randomPlay = randomPlay
+        self.quiescence = quiescence
+        self.ordering = ordering
+        self.search = search
+        self.aspiration = aspiration
+        self.openingBook = openingBook
+
+    def play(self, game: Checkers, player: int, cnt: int) -> Tuple[bool, bool]:
+        """Play a move of the player
+
+        Args:
+            game (Checkers): the game
+            player (int): the type of the player (WHITE, BLACK)
+            cnt (int): the number of moves without capture
+
+        Returns:
+            continue (bool): false if there is no further plays.
+            reset (bool): true when there is a captured piece.
+        """
+        if self.randomPlay:
+            return game.randomPlay(player, enablePrint=False)
+        evaluate = self.evaluate if cnt <= self.endGameAfter else self.endGame
+        return game.minimaxPlay(
+            player, maxDepth=self.maxDepth, evaluate=evaluate, enablePrint=False,
+            timeLimit=self.timeLimit, quiescence=self.quiescence, ordering=self.ordering,
+            search=self.search, aspiration=self.aspiration
+        )
+
+
+def playGame(task) -> Tuple[int, int, int, SearchStats, SearchStats]:
+    """Play a single game of a tournament, the first player starts
+
+    Args:
+        task (tuple): index of the game, seed, first player, second player, game class,
+            size of the board, memory of the transposition table, starting player, max moves without capture
+            paths of the endgame tablebase and the opening book and if the search statistics are collected
+
+    Returns:
+        index (int): the index of the game.
+        result (int): 1 if the first player wins, -1 if it loses and 0 for a draw.
+        plies (int): the number of played moves.
+        firstStats (SearchStats): the search statistics of the first player, None if they aren't collected.
+        secondStats (SearchStats): the search statistics of the second player, None if they aren't collected.
+    """
+    (index, seed, first, second, gameClass, size, ttSize,
+     startPlayer, maxMoves, tablebase, openingBook, collectStats) = task
+    random.seed(seed)
+    game = gameClass(size, ttSize)
+    if tablebase is not None:
+        game.tablebase = Tablebase(tablebase)
+    book = OpeningBook(openingBook) if openingBook is not None else None
+    player = startPlayer
+    stats = [SearchStats(), SearchStats()] if collectStats else [None, None]
+    cnt = 0
+    plies = 0
+    while cnt < maxMoves:
+        config = first if player == startPlayer else second
+        game.stats = stats[0] if player == startPlayer else stats[1]
+        game.openingBook = book if config.openingBook else None
+        cont, reset = config.play(game, player, cnt)
+        if not cont:
+            break
+        player = 1 - player
+        cnt += 1
+        plies += 1
+        if reset:
+            cnt = 0
+
+    if cnt == maxMoves:
+        return index, 0, plies, stats[0], stats[1]
+    return index, 1 if player != startPlayer else -1, plies, stats[0], stats[1]
+
+
+def wilson(k: int, n: int, z: float = 1.96) -> Tuple[float, float]:
+    """Get the wilson confidence interval of a proportion
+
+    Args:
+        k (int): the number of successes
+        n (int): the number of trials
+        z (float, optional): the z-score of the confidence level. Defaults to 1.96 (95%).
+
+    Returns:
+        (float, float): the lower and upper bounds of the proportion
+    """
+    if n == 0:
+        return 0.0, 1.0
+    p = k / n
+    center = (p + z * z / (2 * n)) / (1 + z * z / n)
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+class Tournament(object):
+    """
+    plays games between two players in a pool of processes,
+    every game has its own seed so the tournament can be reproduced
+    """
+
+    def __init__(
+        self,
+        first: PlayerConfig,
+        second: PlayerConfig,
+        games: int = 100,
+        seed: int = 0,
+        processes: int = None,
+        size: int = 8,
+        gameClass: type = BitboardCheckers,
+        ttSize: float = 0,
+        startPlayer: int = Checkers.BLACK,
+        maxMoves: int = 100,
+        tablebase: str = None,
+        openingBook: str = None,
+        stats: bool = False,
+    ) -> None:
+        """Make a tournament
+
+        Args:
+            first (PlayerConfig): the first player, it starts every game
+            second (PlayerConfig): the second player
+            games (int, optional): the number of games. Defaults to 100.
+            seed (int, optional): the seed of the first game, the game i uses seed + i. Defaults to 0.
+            processes (int, optional): the number of processes. Defaults to the number of cpus.
+            size (int, optional): size of the checkers board. Defaults to 8.
+            gameClass (type, optional): the class of the game (Checkers, BitboardCheckers).
+                Defaults to BitboardCheckers.
+            ttSize (float, optional): the memory of the transposition table of each game in megabytes.
+                Defaults to 0.
+            startPlayer (int, optional): the type of the first player (WHITE, BLACK). Defaults to BLACK.
+            maxMoves (int, optional): the number of moves without capture to draw. Defaults to 100.
+            tablebase (str, optional): the path of the endgame tablebase used by both players. Defaults to None.
+            openingBook (str, optional): the path of the opening book used by the players
+                with PlayerConfig.openingBook, the book moves are fixed so the games start the same way,
+                and they don't depend on the settings of the players. Defaults to None.
+            stats (bool, optional): collect the search statistics of the players
+                in firstStats and secondStats. Defaults to False.
+        """
+        self.first = first
+        self.second = second
+        self.games = games
+        self.seed = seed
+        self.processes = processes
+        self.size = size
+        self.gameClass = gameClass
+        self.ttSize = ttSize
+        self.startPlayer = startPlayer
+        self.maxMoves = maxMoves
+        self.tablebase = tablebase
+        self.openingBook = openingBook
+        self.stats = stats
+        self.firstStats = SearchStats()
+        self.secondStats = SearchStats()
+        self.wins = 0
+        self.draws = 0
+        self.loses = 0
+
+    def run(self) -> Iterator[Tuple[int, int, int]]:
+        """Play the games, the results are given once their games end
+
+        Yields:
+            index (int): the index of the game.
+            result (int): 1 if the first player wins, -1 if it loses and 0 for a draw.
+            plies (int): the number of played moves.
+        """
+        tasks = [
+            (i, self.seed + i, self.first, self.second, self.gameClass,
+             self.size, self.ttSize, self.startPlayer, self.maxMoves, self.tablebase, self.openingBook, self.stats)
+            for i in range(self.games)
+        ]
+        with multiprocessing.Pool(self.processes) as pool:
+            for index, result, plies, firstStats, secondStats in pool.imap_unordered(playGame, tasks):
+                if self.stats:
+                    self.firstStats.merge(firstStats)
+                    self.secondStats.merge(secondStats)
+                if result == 1:
+                    self.wins += 1
+                elif result == 0:
+                    self.draws += 1
+                else:
+                    self.loses += 1
+                yield index, result, plies
+
+    def summary(self) -> str:
+        """Get the wins, draws and loses of the first player with their 95% confidence intervals
+
+        Returns:
+            str: the summary of the tournament
+        """
+        games = self.wins + self.draws + self.loses
+        lines = []
+        for name, k in (("wins", self.wins), ("draws", self.draws), ("loses", self.loses)):
+            low, high = wilson(k, games)
+            lines.append(f"{name}: {k}/{games} ({100*k/max(games, 1):.1f}%, 95% CI {100*low:.1f}%-{100*high:.1f}%)")
+
+        # the score is 1 for a win and 0.5 for a draw
+        score = (self.wins + 0.5 * self.draws) / max(games, 1)
+        variance = (self.wins + 0.25 * self.draws) / max(games, 1) - score * score
+        margin = 1.96 * math.sqrt(max(variance, 0) / max(games, 1))
+        lines.append(f"score: {100*score:.1f}% +- {100*margin:.1f}%")
+        return "\n".join(lines)
@@ -0,0 +1,79 @@
+from typing import Any, Optional, Tuple
+
+# key, depth, value, bound type, best move
+Entry = Tuple[int, int, int, int, Any]
+
+
+class TranspositionTable(object):
+    """
+    transposition table of the searched positions with a limited size,
+    every bucket has two entries, the first one keeps the deepest search
+    and the second one is always replaced by the latest search
+    """
+
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+    # approximate memory used by a single entry in bytes
+    ENTRY_SIZE = 200
+
+    def __init__(self, sizeMB: float = 16) -> None:
+        """Make an empty transposition table
+
+        Args:
+            sizeMB (float, optional): the max memory used by the table in megabytes. Defaults to 16.
+        """
+        self.buckets = max(1, int(sizeMB * 2 ** 20) // (2 * self.ENTRY_SIZE))
+        self.clear()
+
+    def clear(self):
+        """Remove all the entries of the table"""
+        self.depthPreferred = [None] * self.buckets
+        self.alwaysReplace = [None] * self.buckets
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def probe(self, key: int) -> Optional[Entry]:
+        """Get the entry of a position
+
+        Args:
+            key (int): the hash of the position
+
+        Returns:
+            Entry: the stored entry (key, depth, value, bound, move) or None if it's not found
+        """
+        self.probes += 1
+        i = key % self.buckets
+        entry = self.depthPreferred[i]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        entry = self.alwaysReplace[i]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, value: int, bound: int, move: Any):
+        """Store the result of searching a position,
+        it replaces the deep entry if it's searched deeper (or it's the same position),
+        otherwise it replaces the latest entry
+
+        Args:
+            key (int): the hash of the position
+            depth (int): the remaining depth searched below the position
+            value (int): the score of the position
+            bound (int): the type of the score (EXACT, LOWER, UPPER)
+            move (Any): the best move found
+        """
+        self.stores += 1
+        i = key % self.buckets
+        entry = (key, depth, value, bound, move)
+        old = self.depthPreferred[i]
+        if old is None or old[0] == key or depth >= old[1]:
+            self.depthPreferred[i] = entry
+            if old is not None and old[0] != key:
+                self.alwaysReplace[i] = old
+        else:
+            self.alwaysReplace[i] = entry
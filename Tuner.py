@@ -0,0 +1,294 @@
+import os
+import sys
+from typing import Callable, Tuple
+from Checkers import Checkers
+from NumpyEvaluation import NumpyEvaluator
+from SelfPlay import HEADER, MAGIC, chunkFiles, darkSquares, packedSize
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def chunkArray(path: str) -> Tuple[int, "np.memmap"]:
+    """Memory map the records of a self-play chunk file
+
+    Args:
+        path (str): the path of the chunk file
+
+    Raises:
+        Exception: if it's not a self-play chunk file
+
+    Returns:
+        size (int): size of the checkers board.
+        records (np.memmap): the records with the fields board (packed), player, scored, score and result.
+    """
+    with open(path, "rb") as f:
+        magic, size, count = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC:
+        raise Exception("The file isn't a checkers self-play chunk")
+    dtype = np.dtype([
+        ("board", np.uint8, (packedSize(size),)), ("player", np.uint8),
+        ("scored", np.uint8), ("score", "<i4"), ("result", np.int8),
+    ])
+    return size, np.memmap(path, dtype=dtype, mode="r", offset=HEADER.size, shape=(count,))
+
+
+def unpackBoards(packed: "np.ndarray", size: int) -> "np.ndarray":
+    """Unpack many boards packed by SelfPlay.packBoard
+
+    Args:
+        packed (np.ndarray): uint8 array of shape (number of boards, packed size)
+        size (int): size of the checkers board
+
+    Returns:
+        np.ndarray: int8 array of shape (number of boards, size, size)
+    """
+    squares = np.stack([packed & 15, packed >> 4], axis=2).reshape(len(packed), -1)
+    boards = np.zeros((len(packed), size * size), dtype=np.int8)
+    indices = [x * size + y for x, y in darkSquares(size)]
+    boards[:, indices] = squares[:, :len(indices)]
+    return boards.reshape(len(packed), size, size)
+
+
+def extractFeatures(directory: str, batchSize: int = 1 << 16, enablePrint: bool = True) -> Tuple["np.memmap", "np.memmap"]:
+    """Compute the features of evaluate2 of every stored position for the player to move,
+    they are written to features.npy and results.npy in the directory, one batch at a time
+
+    Args:
+        directory (str): the directory of the self-play chunk files
+        batchSize (int, optional): the number of positions of every batch. Defaults to 2^16.
+        enablePrint (bool, optional): print the progress to stdout. Defaults to True.
+
+    Returns:
+        features (np.memmap): int32 array of shape (number of positions, number of features).
+        results (np.memmap): the results for the player to move (1 win, 0 draw, -1 loss).
+    """
+    chunks = [chunkArray(path) for path in chunkFiles(directory)]
+    total = sum(len(chunk) for _, chunk in chunks)
+    evaluator = NumpyEvaluator()
+    features = np.lib.format.open_memmap(
+        os.path.join(directory, "features.npy"), mode="w+", dtype=np.int32, shape=(total, len(evaluator.FEATURES))
+    )
+    results = np.lib.format.open_memmap(os.path.join(directory, "results.npy"), mode="w+", dtype=np.int8, shape=(total,))
+    done = 0
+    for size, chunk in chunks:
+        for start in range(0, len(chunk), batchSize):
+            records = chunk[start:start + batchSize]
+            boards = unpackBoards(records["board"], size)
+            features[done:done + len(records)] = evaluator.features(boards, records["player"])
+            results[done:done + len(records)] = records["result"]
+            done += len(records)
+            if enablePrint:
+                print(f"{done}/{total} positions", end="\r")
+    features.flush()
+    results.flush()
+    if enablePrint:
+        print()
+    return features, results
+
+
+def predict(features: "np.ndarray", weights: "np.ndarray", scale: float) -> "np.ndarray":
+    """Get the expected results of positions from their scores, 0 for a loss and 1 for a win
+
+    Args:
+        features (np.ndarray): the features of the positions
+        weights (np.ndarray): the weights of the features
+        scale (float): the scale of the scores in the sigmoid
+
+    Returns:
+        np.ndarray: the expected result of every position
+    """
+    scores = np.asarray(features, dtype=np.float64) @ weights
+    return 1 / (1 + np.exp(np.clip(-scale * scores, -500, 500)))
+
+
+def loss(
+    features: "np.ndarray", results: "np.ndarray", weights: Tuple[float, ...], scale: float, batchSize: int = 1 << 16
+) -> float:
+    """Get the mean squared error between the expected and the real results of the positions,
+    it's computed one batch at a time
+
+    Args:
+        features (np.ndarray): the features of the positions (extractFeatures)
+        results (np.ndarray): the results of the positions (extractFeatures)
+        weights (Tuple[float, ...]): the weights of the features
+        scale (float): the scale of the scores in the sigmoid
+        batchSize (int, optional): the number of positions of every batch. Defaults to 2^16.
+
+    Returns:
+        float: the error
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    total = 0.0
+    for start in range(0, len(features), batchSize):
+        targets = (results[start:start + batchSize] + 1) / 2
+        total += np.sum((predict(features[start:start + batchSize], weights, scale) - targets) ** 2)
+    return total / max(len(features), 1)
+
+
+def fitScale(
+    features: "np.ndarray", results: "np.ndarray", weights: Tuple[float, ...], batchSize: int = 1 << 16
+) -> float:
+    """Find the scale of the scores that fits the results best with the given weights,
+    by golden section search on its logarithm
+
+    Args:
+        features (np.ndarray): the features of the positions (extractFeatures)
+        results (np.ndarray): the results of the positions (extractFeatures)
+        weights (Tuple[float, ...]): the weights of the features
+        batchSize (int, optional): the number of positions of every batch. Defaults to 2^16.
+
+    Returns:
+        float: the scale
+    """
+    ratio = (5 ** 0.5 - 1) / 2
+    low, high = -7.0, -1.0
+    for _ in range(30):
+        a = high - ratio * (high - low)
+        b = low + ratio * (high - low)
+        if loss(features, results, weights, 10 ** a, batchSize) < loss(features, results, weights, 10 ** b, batchSize):
+            high = b
+        else:
+            low = a
+    return 10 ** ((low + high) / 2)
+
+
+def tune(
+    features: "np.ndarray",
+    results: "np.ndarray",
+    weights: Tuple[float, ...] = Checkers.EVALUATE2_WEIGHTS,
+    scale: float = None,
+    epochs: int = 200,
+    learningRate: float = 10,
+    batchSize: int = 1 << 16,
+    enablePrint: bool = True,
+) -> Tuple[int, ...]:
+    """Fit the weights of evaluate2 to the results of the positions (texel tuning),
+    the error of the expected results is minimized by gradient descent (adam),
+    every epoch is a pass over the memory mapped features one batch at a time
+
+    Args:
+        features (np.ndarray): the features of the positions (extractFeatures)
+        results (np.ndarray): the results of the positions (extractFeatures)
+        weights (Tuple[float, ...], optional): the initial weights. Defaults to the weights of evaluate2.
+        scale (float, optional): the scale of the scores in the sigmoid, it's fixed while tuning.
+            Defaults to the best scale of the initial weights (fitScale).
+        epochs (int, optional): the number of passes over the positions. Defaults to 200.
+        learningRate (float, optional): the max change of a weight in every epoch. Defaults to 10.
+        batchSize (int, optional): the number of positions of every batch. Defaults to 2^16.
+        enablePrint (bool, optional): print the error of every epoch to stdout. Defaults to True.
+
+    Returns:
+        Tuple[int, ...]: the tuned weights
+    """
+    if scale is None:
+        scale = fitScale(features, results, weights, batchSize)
+    weights = np.array(weights, dtype=np.float64)
+    moment = np.zeros_like(weights)
+    velocity = np.zeros_like(weights)
+    beta1, beta2 = 0.9, 0.999
+    for epoch in range(1, epochs + 1):
+        gradient = np.zeros_like(weights)
+        error = 0.0
+        for start in range(0, len(features), batchSize):
+            batch = np.asarray(features[start:start + batchSize], dtype=np.float64)
+            targets = (results[start:start + batchSize] + 1) / 2
+            predicted = predict(batch, weights, scale)
+            error += np.sum((predicted - targets) ** 2)
+            gradient += (2 * scale * (predicted - targets) * predicted * (1 - predicted)) @ batch
+        gradient /= max(len(features), 1)
+        moment = beta1 * moment + (1 - beta1) * gradient
+        velocity = beta2 * velocity + (1 - beta2) * gradient ** 2
+        step = (moment / (1 - beta1 ** epoch)) / (np.sqrt(velocity / (1 - beta2 ** epoch)) + 1e-12)
+        weights -= learningRate * step
+        if enablePrint:
+            print(f"epoch {epoch}: error {error / max(len(features), 1):.6f}", end="\r")
+    if enablePrint:
+        print()
+    return tuple(int(round(w)) for w in weights)
+
+
+class WeightedEvaluation(object):
+    """
+    evaluate2 with its own weights as an evaluation function (evaluation(game, maximizer)),
+    the evaluations with the same weights are equal and have the same hash, so they share the keys
+    of the transposition table (Checkers.searchKey) even when they are pickled to other processes
+    """
+
+    def __init__(self, weights: Tuple[int, ...]) -> None:
+        """Make an evaluation function
+
+        Args:
+            weights (Tuple[int, ...]): the weights of the features of evaluate2
+        """
+        self.weights = tuple(int(w) for w in weights)
+
+    def __call__(self, game: Checkers, maximizer: int) -> int:
+        """Evaluate the current board of a game
+
+        Args:
+            game (Checkers): the game
+            maximizer (int): the type of the maximizer player (WHITE, BLACK)
+
+        Returns:
+            int: score of the board
+        """
+        return game.evaluate2(maximizer, self.weights)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, WeightedEvaluation) and other.weights == self.weights
+
+    def __hash__(self) -> int:
+        return hash(self.weights)
+
+    def __repr__(self) -> str:
+        return f"WeightedEvaluation({self.weights})"
+
+
+def evaluator(weights: Tuple[int, ...]) -> Callable[[int], int]:
+    """Get evaluate2 with the given weights as an evaluation function,
+    it can be passed to minimaxPlay, a PlayerConfig or a ParallelSearch
+
+    Args:
+        weights (Tuple[int, ...]): the weights of the features
+
+    Returns:
+        Callable[[int], int]: the evaluation function
+    """
+    return WeightedEvaluation(weights)
+
+
+def saveWeights(path: str, weights: Tuple[int, ...]):
+    """Write the weights to a text file
+
+    Args:
+        path (str): the path of the file
+        weights (Tuple[int, ...]): the weights of the features
+    """
+    with open(path, "w") as f:
+        f.write(" ".join(str(w) for w in weights) + "\n")
+
+
+def loadWeights(path: str) -> Tuple[int, ...]:
+    """Read the weights written by saveWeights
+
+    Args:
+        path (str): the path of the file
+
+    Returns:
+        Tuple[int, ...]: the weights of the features
+    """
+    with open(path) as f:
+        return tuple(int(w) for w in f.read().split())
+
+
+if __name__ == "__main__":
+    # python Tuner.py [directory] [epochs]
+    directory = sys.argv[1] if len(sys.argv) > 1 else "selfplay"
+    epochs = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    features, results = extractFeatures(directory)
+    weights = tune(features, results, epochs=epochs)
+    print("weights:", " ".join(f"{name}={w}" for name, w in zip(NumpyEvaluator.FEATURES, weights)))
+    saveWeights(os.path.join(directory, "weights.txt"), weights)